@@ -31,4 +31,4 @@ echo ""
 python -m src.main --conversations 3 --show-transcript 1
 
 echo ""
-echo "Demo complete! Check data/results/ for saved evaluation data."
\ No newline at end of file
+echo "Demo complete! Run 'python -m src.main report' to revisit the saved results."
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Run-level budget governor for tokens, dollars and wall-clock time.
+
+One ``BudgetGovernor`` is shared by the therapist, client simulator and
+evaluator of a run. Every API response reports its token usage to it, and
+the orchestrator asks it for admission before starting each conversation.
+Once a limit is reached no new conversations start; conversations already
+in flight are allowed to finish (or are cancelled at the deadline) so the
+completed results can still be saved.
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# USD per million (prompt, completion) tokens, matched by model name prefix
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+def model_prices(model: str) -> Tuple[float, float]:
+    """Return (prompt, completion) USD per million tokens for ``model``."""
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_PRICES[prefix]
+    raise ValueError(f"No pricing known for model {model}; set INPUT_COST_PER_MILLION "
+                     "and OUTPUT_COST_PER_MILLION")
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> datetime:
+    """Parse a deadline given as a duration or a clock time.
+
+    Durations are seconds or use an ``s``/``m``/``h`` suffix (``90m``).
+    Clock times are ISO datetimes or ``HH:MM``, meaning the next such time.
+    Datetimes with a UTC offset are converted to naive local time.
+    """
+    now = now or datetime.now()
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smh]?)", value.strip())
+    if match:
+        amount, unit = float(match.group(1)), match.group(2) or "s"
+        return now + timedelta(seconds=amount * {"s": 1, "m": 60, "h": 3600}[unit])
+
+    if re.fullmatch(r"\d{1,2}:\d{2}", value.strip()):
+        hour, minute = map(int, value.split(":"))
+        deadline = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return deadline if deadline > now else deadline + timedelta(days=1)
+
+    try:
+        deadline = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid deadline: {value}")
+    if deadline.tzinfo is not None:
+        deadline = deadline.astimezone().replace(tzinfo=None)
+    return deadline
+
+class BudgetGovernor:
+    """Tracks spend and gates conversation admission against run limits."""
+
+    def __init__(self, max_concurrency: int = 10,
+                 max_cost: Optional[float] = None,
+                 max_tokens: Optional[int] = None,
+                 deadline: Optional[datetime] = None,
+                 prices: Optional[Tuple[float, float]] = None):
+        self.max_concurrency = max_concurrency
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.deadline = deadline
+        self.prices = prices
+
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.calls = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.stopped_reason: Optional[str] = None
+        self._total_duration = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "BudgetGovernor":
+        """Build a governor from run ``Settings``."""
+        prices = None
+        if settings.input_cost_per_million is not None or settings.output_cost_per_million is not None:
+            prices = (settings.input_cost_per_million or 0.0,
+                      settings.output_cost_per_million or 0.0)
+        elif settings.max_cost is not None:
+            prices = model_prices(settings.model)
+        return cls(
+            max_concurrency=settings.max_concurrent_conversations,
+            max_cost=settings.max_cost,
+            max_tokens=settings.max_tokens,
+            deadline=parse_deadline(settings.deadline) if settings.deadline else None,
+            prices=prices
+        )
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def record_usage(self, model: str, usage: Optional[Mapping[str, Any]]) -> None:
+        """Record the ``usage`` block of an API response."""
+        if not usage:
+            return
+        prompt = int(usage.get("prompt_tokens", 0))
+        completion = int(usage.get("completion_tokens", 0))
+        self.calls += 1
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+
+        prices = self.prices
+        if prices is None:
+            try:
+                prices = model_prices(model)
+            except ValueError:
+                prices = (0.0, 0.0)
+        self.cost += (prompt * prices[0] + completion * prices[1]) / 1_000_000
+
+    def time_remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or ``None`` without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, (self.deadline - datetime.now()).total_seconds())
+
+    def exhausted(self) -> Optional[str]:
+        """Return the name of the first exhausted limit, if any."""
+        if self.max_cost is not None and self.cost >= self.max_cost:
+            return "max_cost"
+        if self.max_tokens is not None and self.total_tokens >= self.max_tokens:
+            return "max_tokens"
+        if self.deadline is not None and self.time_remaining() <= 0:
+            return "deadline"
+        return None
+
+    def concurrency_limit(self) -> Tuple[int, Optional[str]]:
+        """Conversations allowed in flight, and the limit constraining it.
+
+        Per-conversation spend is estimated from everything spent so far
+        divided by completed conversations, which overestimates while
+        conversations are in flight and so errs on the side of caution.
+        """
+        limit, reason = self.max_concurrency, None
+        if not self.completed:
+            return limit, reason
+
+        def constrain(allowed: int, name: str):
+            nonlocal limit, reason
+            if allowed < limit:
+                limit, reason = max(allowed, 0), name
+
+        if self.max_cost is not None and self.cost > 0:
+            per_conversation = self.cost / self.completed
+            constrain(int((self.max_cost - self.cost) / per_conversation), "max_cost")
+        if self.max_tokens is not None and self.total_tokens > 0:
+            per_conversation = self.total_tokens / self.completed
+            constrain(int((self.max_tokens - self.total_tokens) / per_conversation), "max_tokens")
+        if self.deadline is not None:
+            if self.time_remaining() < self._total_duration / self.completed:
+                constrain(0, "deadline")
+        return limit, reason
+
+    async def acquire(self) -> bool:
+        """Wait for an admission slot; ``False`` means the budget is spent."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            while True:
+                reason = self.exhausted()
+                limit, limiting = self.concurrency_limit()
+                if reason is None and limit == 0 and self.in_flight == 0:
+                    # Nothing in flight can free a slot, so stop rather than wait
+                    reason = limiting
+                if reason:
+                    self.stopped_reason = self.stopped_reason or reason
+                    self.skipped += 1
+                    return False
+                if self.in_flight < limit:
+                    self.in_flight += 1
+                    return True
+                await self._condition.wait()
+
+    async def release(self, duration: float, completed: bool = True) -> None:
+        """Return an admission slot after a conversation ends."""
+        async with self._condition:
+            self.in_flight -= 1
+            if completed:
+                self.completed += 1
+                self._total_duration += duration
+            self._condition.notify_all()
+
+    def summary(self) -> Dict[str, Any]:
+        """Spend and limits, for saved results and reports."""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cost_usd": round(self.cost, 6),
+            "api_calls": self.calls,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "max_cost": self.max_cost,
+            "max_tokens": self.max_tokens,
+            "deadline": self.deadline.isoformat() if self.deadline else None,
+            "stopped_reason": self.stopped_reason,
+        }
@@ -2,17 +2,23 @@
 import openai
 from typing import List, Dict, Optional
 import asyncio
-from src.config import Config
+from src.budget import BudgetGovernor
+from src.config import Settings, get_settings
+from src.output import get_reporter
 from src.personas import Persona
 
 class ClientSimulator:
     """Simulates realistic client responses in therapy."""
     
-    def __init__(self, persona: Persona, api_key: Optional[str] = None):
+    def __init__(self, persona: Persona, api_key: Optional[str] = None,
+                 settings: Optional[Settings] = None,
+                 governor: Optional[BudgetGovernor] = None):
         """Initialize with a specific persona."""
         self.persona = persona
-        openai.api_key = api_key or Config.OPENAI_API_KEY
-        self.model = Config.MODEL
+        self.settings = settings or get_settings()
+        self.governor = governor
+        openai.api_key = api_key or self.settings.openai_api_key
+        self.model = self.settings.model
         self.turn_count = 0
         
     def _get_turn_guidance(self) -> str:
@@ -44,10 +50,13 @@ class ClientSimulator:
                 messages=messages,
                 temperature=0.8,  # More variation in client responses
                 max_tokens=150,
-                timeout=Config.API_TIMEOUT
+                timeout=self.settings.api_timeout
             )
+            if self.governor:
+                self.governor.record_usage(self.model, response.get("usage"))
             self.turn_count += 1
             return response.choices[0].message.content.strip()
         except Exception as e:
-            print(f"Client simulator error: {e}")
+            get_reporter().log("error", "Client simulator error",
+                               persona=self.persona.name, error=str(e))
             return "I'm not sure how to express what I'm feeling right now."
\ No newline at end of file
@@ -1,37 +1,164 @@
 """Configuration management for the therapy evaluation system."""
+import json
 import os
-from typing import Optional
-from dotenv import load_dotenv
+import typing
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Mapping, Optional
 
-load_dotenv()
+@dataclass(frozen=True)
+class Settings:
+    """System configuration.
+
+    Settings are plain values; nothing is read from the environment until
+    ``Settings.load`` is called, so tests can build isolated instances
+    directly or via ``with_overrides``.
+    """
 
-class Config:
-    """System configuration."""
-    
     # OpenAI settings
-    OPENAI_API_KEY: str = os.getenv(
-        "OPENAI_API_KEY"
-    )
-    MODEL: str = "gpt-4.1-mini-2025-04-14"
-    
+    openai_api_key: Optional[str] = None
+    model: str = "gpt-4.1-mini-2025-04-14"
+
     # Conversation settings
-    CONVERSATION_TURNS: int = 5
-    MAX_CONCURRENT_CONVERSATIONS: int = 10
-    
+    conversation_turns: int = 5
+    max_concurrent_conversations: int = 10
+
     # Output settings
-    RESULTS_DIR: str = "data/results"
-    
+    results_dir: str = "data/results"
+    store_dir: str = "data/store"  # compressed, indexed archive of all runs
+    save_json: bool = False  # also write an indented eval_results_*.json per run
+    log_format: str = "text"  # "text" or "jsonl"
+
+    # Near-duplicate detection
+    near_duplicate_threshold: float = 0.8  # estimated Jaccard similarity
+    reuse_duplicate_evaluations: bool = False
+
     # Therapist settings
-    THERAPIST_MAX_WORDS: int = 120
-    
+    therapist_max_words: int = 120
+
     # Timeout settings
-    API_TIMEOUT: int = 30  # seconds
-    
+    api_timeout: int = 30  # seconds
+
+    # Budget settings (unset means unlimited)
+    max_cost: Optional[float] = None  # USD
+    max_tokens: Optional[int] = None
+    deadline: Optional[str] = None  # duration ("90m") or clock time ("06:00")
+    input_cost_per_million: Optional[float] = None  # USD, overrides model pricing
+    output_cost_per_million: Optional[float] = None
+
+    @classmethod
+    def env_var(cls, name: str) -> str:
+        """Environment variable that overrides the named setting."""
+        return name.upper()
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, Any],
+                     base: Optional["Settings"] = None) -> "Settings":
+        """Build settings from a mapping of field names to raw values.
+
+        Unknown keys are rejected so typos in config files fail loudly;
+        ``None`` values are ignored so unset CLI options fall through.
+        """
+        base = base or cls()
+        known = {f.name: f for f in fields(cls)}
+        unknown = set(values) - set(known)
+        if unknown:
+            raise ValueError(f"Unknown setting(s): {', '.join(sorted(unknown))}")
+
+        updates = {
+            name: _coerce(known[name].type, value)
+            for name, value in values.items()
+            if value is not None
+        }
+        return replace(base, **updates)
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None,
+                 base: Optional["Settings"] = None) -> "Settings":
+        """Build settings from environment variables (``MODEL``, ``RESULTS_DIR``, ...)."""
+        env = os.environ if env is None else env
+        values = {
+            f.name: env[cls.env_var(f.name)]
+            for f in fields(cls)
+            if env.get(cls.env_var(f.name))
+        }
+        return cls.from_mapping(values, base=base)
+
     @classmethod
-    def validate(cls) -> None:
+    def from_file(cls, path: str, base: Optional["Settings"] = None) -> "Settings":
+        """Build settings from a JSON file keyed by setting name."""
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Config file {path} must contain a JSON object")
+        return cls.from_mapping(data, base=base)
+
+    @classmethod
+    def load(cls, config_file: Optional[str] = None,
+             overrides: Optional[Mapping[str, Any]] = None,
+             env: Optional[Mapping[str, str]] = None,
+             use_dotenv: bool = True) -> "Settings":
+        """Resolve settings with precedence defaults < file < env < overrides."""
+        if use_dotenv and env is None:
+            from dotenv import load_dotenv
+            load_dotenv()
+
+        settings = cls()
+        if config_file:
+            settings = cls.from_file(config_file, base=settings)
+        settings = cls.from_env(env, base=settings)
+        if overrides:
+            settings = cls.from_mapping(overrides, base=settings)
+        return settings
+
+    def with_overrides(self, **overrides: Any) -> "Settings":
+        """Return a copy with the given (non-``None``) settings replaced."""
+        return self.from_mapping(overrides, base=self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary, omitting secrets."""
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name != "openai_api_key"
+        }
+
+    def validate(self, require_api_key: bool = True) -> None:
         """Validate configuration."""
-        if not cls.OPENAI_API_KEY:
+        if require_api_key and not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY is required")
-        
-        # Create results directory if it doesn't exist
-        os.makedirs(cls.RESULTS_DIR, exist_ok=True)
\ No newline at end of file
+        if self.conversation_turns < 1:
+            raise ValueError("conversation_turns must be at least 1")
+        if self.max_concurrent_conversations < 1:
+            raise ValueError("max_concurrent_conversations must be at least 1")
+        if self.log_format not in ("text", "jsonl"):
+            raise ValueError("log_format must be 'text' or 'jsonl'")
+        if not 0 < self.near_duplicate_threshold <= 1:
+            raise ValueError("near_duplicate_threshold must be in (0, 1]")
+        if self.max_cost is not None and self.max_cost <= 0:
+            raise ValueError("max_cost must be positive")
+        if self.max_tokens is not None and self.max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+
+def _coerce(field_type: Any, value: Any) -> Any:
+    """Coerce a raw (usually string) value to a settings field type."""
+    if typing.get_origin(field_type) is typing.Union:
+        if value is None:
+            return None
+        field_type = next(t for t in typing.get_args(field_type) if t is not type(None))
+
+    if field_type is bool and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if field_type in (int, float) and not isinstance(value, field_type):
+        return field_type(value)
+    if field_type is str and not isinstance(value, str):
+        return str(value)
+    return value
+
+_settings: Optional[Settings] = None
+
+def get_settings() -> Settings:
+    """Return process-wide settings, loading them on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings.load()
+    return _settings
@@ -1,62 +1,51 @@
 """Orchestrates therapy conversations."""
 import asyncio
-from typing import Dict, List, Any
+from dataclasses import replace
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime
 from src.personas import Persona
 from src.therapist import AITherapist
 from src.client import ClientSimulator
 from src.evaluator import ConversationEvaluator, EvaluationScore
-from src.config import Config
-
-class ConversationResult:
-    """Results of a single therapy conversation."""
-    
-    def __init__(self, persona: Persona, transcript: List[Dict[str, str]], 
-                 evaluation: EvaluationScore, duration: float):
-        self.persona = persona
-        self.transcript = transcript
-        self.evaluation = evaluation
-        self.duration = duration
-        self.timestamp = datetime.now()
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return {
-            "persona": {
-                "name": self.persona.name,
-                "age": self.persona.age,
-                "background": self.persona.background,
-                "presenting_issue": self.persona.presenting_issue
-            },
-            "transcript": self.transcript,
-            "evaluation": self.evaluation.to_dict(),
-            "duration_seconds": self.duration,
-            "timestamp": self.timestamp.isoformat()
-        }
-    
-    def format_transcript(self) -> str:
-        """Format transcript for display."""
-        lines = []
-        for i, msg in enumerate(self.transcript):
-            role = "CLIENT" if msg["role"] == "user" else "THERAPIST"
-            lines.append(f"{role}: {msg['content']}")
-        return "\n".join(lines)
+from src.models import ConversationResult
+from src.budget import BudgetGovernor
+from src.config import Settings, get_settings
+from src.dedup import NearDuplicateIndex
+from src.output import get_reporter
 
 class ConversationOrchestrator:
     """Orchestrates therapy conversations and evaluations."""
     
-    def __init__(self):
-        self.therapist = AITherapist()
-        self.evaluator = ConversationEvaluator()
+    def __init__(self, settings: Optional[Settings] = None,
+                 governor: Optional[BudgetGovernor] = None):
+        self.settings = settings or get_settings()
+        self.governor = governor or BudgetGovernor(
+            max_concurrency=self.settings.max_concurrent_conversations
+        )
+        self.therapist = AITherapist(settings=self.settings, governor=self.governor)
+        self.evaluator = ConversationEvaluator(settings=self.settings, governor=self.governor)
+        self.dedup = NearDuplicateIndex(threshold=self.settings.near_duplicate_threshold)
+        # Pending or finished evaluations of cluster representatives; a
+        # future resolves to None if the representative's evaluation failed
+        self._representative_evaluations: Dict[int, "asyncio.Future[Optional[EvaluationScore]]"] = {}
+        self._next_id = 0
     
     async def run_conversation(self, persona: Persona) -> ConversationResult:
-        """Run a complete therapy conversation."""
+        """Run a complete therapy conversation.
+
+        The transcript is added to the near-duplicate index before it is
+        evaluated. With ``reuse_duplicate_evaluations`` set, a near-duplicate
+        reuses its cluster representative's evaluation instead of calling
+        the evaluator again, waiting for it if it is still in progress.
+        """
         start_time = datetime.now()
-        client = ClientSimulator(persona)
+        conversation_id = self._next_id
+        self._next_id += 1
+        client = ClientSimulator(persona, settings=self.settings, governor=self.governor)
         conversation_history = []
         
         # Run conversation turns
-        for turn in range(Config.CONVERSATION_TURNS):
+        for turn in range(self.settings.conversation_turns):
             # Client message
             client_msg = await client.generate_message(conversation_history)
             conversation_history.append({"role": "user", "content": client_msg})
@@ -68,13 +57,41 @@ class ConversationOrchestrator:
         # Format transcript for evaluation
         transcript = self._format_for_evaluation(conversation_history)
         
+        # Check for a near-duplicate of an earlier transcript; hashing the
+        # shingles runs in a thread so it doesn't stall other conversations
+        signature = await asyncio.to_thread(self.dedup.signature, transcript)
+        match = self.dedup.add(conversation_id, transcript, signature=signature)
+        reused = None
+        if match is None:
+            # Registered before any await so concurrent duplicates can wait on it
+            pending = asyncio.get_running_loop().create_future()
+            self._representative_evaluations[conversation_id] = pending
+        elif self.settings.reuse_duplicate_evaluations:
+            # Shielded so a cancelled duplicate doesn't cancel the shared future
+            reused = await asyncio.shield(self._representative_evaluations[match.representative])
+        
         # Evaluate conversation
-        evaluation = await self.evaluator.evaluate(transcript)
+        if reused is not None:
+            evaluation = replace(reused)
+        elif match is None:
+            evaluation = None
+            try:
+                evaluation = await self.evaluator.evaluate(transcript)
+            finally:
+                pending.set_result(evaluation)
+        else:
+            evaluation = await self.evaluator.evaluate(transcript)
         
         # Calculate duration
         duration = (datetime.now() - start_time).total_seconds()
         
-        return ConversationResult(persona, conversation_history, evaluation, duration)
+        return ConversationResult(
+            persona, conversation_history, evaluation, duration,
+            conversation_id=conversation_id,
+            duplicate_of=match.representative if match else None,
+            similarity=match.similarity if match else None,
+            evaluation_reused=reused is not None
+        )
     
     def _format_for_evaluation(self, history: List[Dict[str, str]]) -> str:
         """Format conversation for evaluator."""
@@ -84,14 +101,47 @@ class ConversationOrchestrator:
             lines.append(f"{role}: {msg['content']}")
         return "\n".join(lines)
     
-    async def run_multiple_conversations(self, personas: List[Persona]) -> List[ConversationResult]:
-        """Run multiple conversations in parallel."""
-        # Limit concurrency to avoid rate limits
-        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_CONVERSATIONS)
+    async def run_multiple_conversations(
+        self, personas: List[Persona],
+        on_complete: Optional[Callable[[ConversationResult], None]] = None
+    ) -> List[ConversationResult]:
+        """Run multiple conversations in parallel.
+
+        ``on_complete`` is called with each result as soon as it finishes;
+        it must not block the event loop. Concurrency and admission are
+        controlled by the budget governor: once a budget runs out, pending
+        conversations are skipped, and at the deadline in-flight ones are
+        cancelled. A conversation that raises is logged and counted as
+        failed without stopping the others. Only completed results are
+        returned, in persona order.
+        """
+        async def run_with_budget(persona: Persona) -> Optional[ConversationResult]:
+            if not await self.governor.acquire():
+                return None
+            start_time = datetime.now()
+            completed = False
+            try:
+                result = await self.run_conversation(persona)
+                completed = True
+            except Exception as e:
+                self.governor.failed += 1
+                get_reporter().log("error", "Conversation failed",
+                                   persona=persona.name, error=str(e))
+                return None
+            finally:
+                duration = (datetime.now() - start_time).total_seconds()
+                await self.governor.release(duration, completed=completed)
+            if on_complete:
+                on_complete(result)
+            return result
         
-        async def run_with_semaphore(persona: Persona) -> ConversationResult:
-            async with semaphore:
-                return await self.run_conversation(persona)
+        tasks = [asyncio.ensure_future(run_with_budget(persona)) for persona in personas]
+        done, pending = await asyncio.wait(tasks, timeout=self.governor.time_remaining())
+        if pending:
+            self.governor.stopped_reason = self.governor.stopped_reason or "deadline"
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
         
-        tasks = [run_with_semaphore(persona) for persona in personas]
-        return await asyncio.gather(*tasks)
\ No newline at end of file
+        return [task.result() for task in tasks
+                if task in done and task.result() is not None]
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""Near-duplicate transcript detection with MinHash and LSH.
+
+Transcripts are reduced to sets of word shingles and summarised by a
+MinHash signature whose matching positions estimate Jaccard similarity.
+Signatures are banded into locality-sensitive hash buckets, so each new
+transcript is only compared against transcripts sharing a bucket. The
+index is incremental: results are added as conversations finish, and each
+near-duplicate joins the cluster whose representative it resembles. Matches
+are checked against the representative itself, not the member that shared
+a bucket, so clusters cannot drift through chains of small changes.
+"""
+import hashlib
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+@dataclass
+class DuplicateMatch:
+    """A near-duplicate found when adding a transcript."""
+    representative: Hashable
+    similarity: float
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Hash the word ``size``-grams of ``text`` to 64-bit integers."""
+    words = re.findall(r"\w+", text.lower())
+    grams = [" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))]
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big")
+        for g in grams
+    }
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) with the LSH threshold just at or below ``threshold``.
+
+    A pair with Jaccard similarity ``s`` becomes a candidate with probability
+    ``1 - (1 - s**rows)**bands``, which rises steeply around
+    ``(1 / bands) ** (1 / rows)``. Erring low keeps recall high; false
+    candidates are filtered by comparing signatures.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+class NearDuplicateIndex:
+    """Incremental MinHash/LSH index over transcripts."""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128,
+                 shingle_size: int = 5, seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        # XOR with random masks permutes the 64-bit shingle hashes cheaply
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(64) for _ in range(num_perm)]
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [
+            {} for _ in range(self.bands)
+        ]
+        self._signatures: Dict[Hashable, List[int]] = {}
+        self.representatives: Dict[Hashable, Hashable] = {}
+        self._best_similarity: Dict[Hashable, float] = {}
+
+    def signature(self, text: str) -> List[int]:
+        """MinHash signature of ``text``."""
+        hashes = shingles(text, self.shingle_size)
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def similarity(self, a: List[int], b: List[int]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    def add(self, key: Hashable, text: str,
+            signature: Optional[List[int]] = None) -> Optional[DuplicateMatch]:
+        """Index ``text`` under ``key`` and return its closest cluster, if any.
+
+        The returned similarity is to the cluster's representative, which
+        must clear the threshold on its own. A precomputed ``signature`` may be passed, e.g. one computed in a
+        worker thread; the index itself must only be updated from one thread.
+        """
+        if key in self._signatures:
+            raise ValueError(f"Duplicate key: {key}")
+        if signature is None:
+            signature = self.signature(text)
+        band_keys = [
+            tuple(signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+        candidates = {
+            other
+            for band, band_key in enumerate(band_keys)
+            for other in self._buckets[band].get(band_key, ())
+        }
+        nearest = max(
+            (self.similarity(signature, self._signatures[other]) for other in candidates),
+            default=0.0
+        )
+        best: Optional[DuplicateMatch] = None
+        for representative in {self.representatives[other] for other in candidates}:
+            score = self.similarity(signature, self._signatures[representative])
+            if best is None or score > best.similarity:
+                best = DuplicateMatch(representative, score)
+
+        self._signatures[key] = signature
+        self._best_similarity[key] = nearest
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+        if best is not None and best.similarity >= self.threshold:
+            self.representatives[key] = best.representative
+            return best
+        self.representatives[key] = key
+        return None
+
+    def clusters(self) -> Dict[Hashable, List[Hashable]]:
+        """Map each cluster representative to its members."""
+        clusters: Dict[Hashable, List[Hashable]] = {}
+        for key, representative in self.representatives.items():
+            clusters.setdefault(representative, []).append(key)
+        return clusters
+
+    def stats(self) -> Dict[str, Any]:
+        """Diversity statistics over everything indexed so far."""
+        total = len(self.representatives)
+        clusters = self.clusters()
+        return {
+            "transcripts": total,
+            "clusters": len(clusters),
+            "near_duplicates": total - len(clusters),
+            "duplicate_rate": round((total - len(clusters)) / total, 3) if total else 0.0,
+            "largest_cluster": max(map(len, clusters.values()), default=0),
+            "mean_nearest_similarity": round(
+                sum(self._best_similarity.values()) / total, 3
+            ) if total else 0.0,
+            "threshold": self.threshold,
+        }
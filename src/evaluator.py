@@ -2,36 +2,11 @@
 import openai
 import json
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
 import asyncio
-from src.config import Config
-
-@dataclass
-class EvaluationScore:
-    """Structured evaluation results."""
-    # Core therapeutic dimensions (0-10)
-    empathy_reflection: int
-    validation_affirmation: int
-    question_quality: int
-    supportive_tone: int
-    
-    # Working Alliance subscales (0-3)
-    alliance_goal: int
-    alliance_approach: int
-    alliance_bond: int
-    
-    # Computed scores
-    alliance_score: int
-    overall_score: int
-    
-    # Qualitative feedback
-    strengths: str
-    improvements: str
-    red_flags: Optional[str] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return asdict(self)
+from src.budget import BudgetGovernor
+from src.config import Settings, get_settings
+from src.models import EvaluationScore
+from src.output import get_reporter
 
 class ConversationEvaluator:
     """Evaluates therapeutic conversations with detailed rubrics."""
@@ -101,10 +76,14 @@ Analyze the conversation and return ONLY valid JSON:
 
 If ethical violations occur (breaking confidentiality, harmful advice, discrimination), set overall_score=1 and describe in red_flags."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 settings: Optional[Settings] = None,
+                 governor: Optional[BudgetGovernor] = None):
         """Initialize evaluator."""
-        openai.api_key = api_key or Config.OPENAI_API_KEY
-        self.model = Config.MODEL
+        self.settings = settings or get_settings()
+        self.governor = governor
+        openai.api_key = api_key or self.settings.openai_api_key
+        self.model = self.settings.model
     
     async def evaluate(self, transcript: str) -> EvaluationScore:
         """Evaluate a conversation transcript."""
@@ -119,8 +98,10 @@ If ethical violations occur (breaking confidentiality, harmful advice, discrimin
                 messages=messages,
                 temperature=0.3,  # Lower temperature for consistent evaluation
                 max_tokens=500,
-                timeout=Config.API_TIMEOUT
+                timeout=self.settings.api_timeout
             )
+            if self.governor:
+                self.governor.record_usage(self.model, response.get("usage"))
             
             content = response.choices[0].message.content.strip()
             data = json.loads(content)
@@ -142,7 +123,7 @@ If ethical violations occur (breaking confidentiality, harmful advice, discrimin
             )
             
         except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
+            get_reporter().log("error", "JSON decode error", error=str(e))
             # Return minimum scores on error
             return EvaluationScore(
                 empathy_reflection=0, validation_affirmation=0,
@@ -153,5 +134,5 @@ If ethical violations occur (breaking confidentiality, harmful advice, discrimin
                 improvements="Could not parse evaluation response"
             )
         except Exception as e:
-            print(f"Evaluation error: {e}")
+            get_reporter().log("error", "Evaluation error", error=str(e))
             raise
\ No newline at end of file
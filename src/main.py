@@ -1,33 +1,51 @@
-"""CLI entry point for the therapy evaluation system."""
-import asyncio
+"""CLI entry point for the therapy evaluation system.
+
+Heavy dependencies (``openai`` via the orchestrator, ``tabulate``,
+``asyncio``) are imported inside the commands that use them, so offline
+commands such as ``report``, ``rescore`` and ``list-personas`` start quickly.
+"""
+import glob
 import json
 import os
+import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import click
-from tabulate import tabulate
-from src.config import Config
-from src.personas import PERSONAS, get_random_personas
-from src.conversation import ConversationOrchestrator, ConversationResult
+from src.config import Settings
+from src.models import ConversationResult
 
 class TherapyEvalCLI:
     """Command-line interface for therapy evaluation."""
-    
-    def __init__(self):
-        self.orchestrator = ConversationOrchestrator()
-        Config.validate()
-    
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._orchestrator = None
+
+    @property
+    def orchestrator(self):
+        """Conversation orchestrator, created (and the API key checked) on first use."""
+        if self._orchestrator is None:
+            from src.budget import BudgetGovernor
+            from src.conversation import ConversationOrchestrator
+            self.settings.validate()
+            self._orchestrator = ConversationOrchestrator(
+                self.settings, governor=BudgetGovernor.from_settings(self.settings)
+            )
+        return self._orchestrator
+
     def print_header(self):
         """Print application header."""
         click.echo("=" * 80)
         click.echo("🧠 AI Therapy Evaluation System")
         click.echo("=" * 80)
-    
+
     def print_summary_table(self, results: List[ConversationResult]):
         """Print summary table of results."""
+        from tabulate import tabulate
+
         headers = ["Persona", "Age", "Overall", "Empathy", "Validation", "Questions", "Alliance", "Red Flags"]
         rows = []
-        
+
         for result in results:
             eval_score = result.evaluation
             rows.append([
@@ -40,80 +58,253 @@ class TherapyEvalCLI:
                 f"{eval_score.alliance_score}/10",
                 "⚠️" if eval_score.red_flags else "✓"
             ])
-        
+
         click.echo("\n📊 Evaluation Summary")
         click.echo(tabulate(rows, headers=headers, tablefmt="grid"))
-        
+
+        if not results:
+            return
+
         # Calculate averages
         avg_overall = sum(r.evaluation.overall_score for r in results) / len(results)
         click.echo(f"\n📈 Average Overall Score: {avg_overall:.1f}/10")
-    
-    def save_results(self, results: List[ConversationResult], output_dir: Optional[str] = None):
-        """Save results to JSON file."""
-        output_dir = output_dir or Config.RESULTS_DIR
-        os.makedirs(output_dir, exist_ok=True)
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(output_dir, f"eval_results_{timestamp}.json")
-        
+
+        # Near-duplicates skew the average towards repeated transcripts. A
+        # cluster whose representative failed is counted once, via its
+        # first remaining member
+        distinct = [r for r in results if r.duplicate_of is None]
+        present = {r.conversation_id for r in distinct}
+        orphans: Dict[int, ConversationResult] = {}
+        for r in results:
+            if r.duplicate_of is not None and r.duplicate_of not in present:
+                orphans.setdefault(r.duplicate_of, r)
+        distinct += orphans.values()
+        if distinct and len(distinct) < len(results):
+            avg_distinct = sum(r.evaluation.overall_score for r in distinct) / len(distinct)
+            click.echo(f"📈 Average Overall Score (distinct transcripts only): {avg_distinct:.1f}/10")
+
+    def detect_near_duplicates(self, results: List[ConversationResult]) -> Dict[str, Any]:
+        """Cluster saved transcripts offline and return diversity statistics.
+
+        Marks ``duplicate_of`` on each result, using the result's position
+        as its conversation ID.
+        """
+        from src.dedup import NearDuplicateIndex
+
+        index = NearDuplicateIndex(threshold=self.settings.near_duplicate_threshold)
+        for i, result in enumerate(results):
+            match = index.add(i, result.format_transcript())
+            result.conversation_id = i
+            result.duplicate_of = match.representative if match else None
+            result.similarity = match.similarity if match else None
+        return index.stats()
+
+    def print_diversity(self, stats: Dict[str, Any]):
+        """Print near-duplicate and diversity statistics."""
+        click.echo(f"\n🧬 Diversity: {stats['transcripts']} transcripts in "
+                   f"{stats['clusters']} clusters, {stats['near_duplicates']} near-duplicates "
+                   f"({stats['duplicate_rate']:.0%}) at Jaccard ≥ {stats['threshold']}, "
+                   f"largest cluster {stats['largest_cluster']}")
+        if stats["transcripts"] > 1 and stats["duplicate_rate"] >= 0.5:
+            click.echo("⚠️ Most transcripts are near-duplicates; the client simulator "
+                       "may have collapsed into repetition")
+
+    def save_results(self, results: List[ConversationResult], output_dir: Optional[str] = None,
+                     config: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None,
+                     **sections: Any) -> Tuple[str, Optional[str]]:
+        """Append results to the result archive, and to a JSON file if enabled.
+
+        ``config`` defaults to the current settings; pass a loaded run's
+        ``config`` to keep the model and turns it was recorded with. A new
+        run ID is generated unless ``run_id`` is given, in which case that
+        run is replaced. Extra ``sections`` (such as the run's ``budget``
+        and ``diversity`` summaries) are written as top-level keys. Returns
+        the run ID and the JSON filename (``None`` unless ``save_json`` is set).
+        """
+        from src.store import ResultStore
+
+        # The suffix keeps runs saved within the same second apart
+        run_id = run_id or f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+
         data = {
             "timestamp": datetime.now().isoformat(),
             "config": {
-                "model": Config.MODEL,
-                "turns_per_conversation": Config.CONVERSATION_TURNS,
+                "model": self.settings.model,
+                "turns_per_conversation": self.settings.conversation_turns,
+                **(config or {}),
                 "num_conversations": len(results)
             },
             "results": [r.to_dict() for r in results]
         }
-        
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        click.echo(f"\n💾 Results saved to: {filename}")
-        return filename
-    
-    async def run_evaluation(self, num_conversations: int = 10, 
+        data.update({k: v for k, v in sections.items() if v is not None})
+
+        filename = None
+        if self.settings.save_json:
+            output_dir = output_dir or self.settings.results_dir
+            os.makedirs(output_dir, exist_ok=True)
+            filename = os.path.join(output_dir, f"eval_results_{run_id}.json")
+            with open(filename, 'w') as f:
+                json.dump(data, f, indent=2)
+
+        with ResultStore(self.settings.store_dir) as store:
+            store.add_run(data, run_id=run_id, source=filename, replace=True)
+
+        if self.settings.log_format == "text":
+            click.echo(f"\n💾 Results archived as run {run_id} in {self.settings.store_dir}")
+            if filename:
+                click.echo(f"💾 Results saved to: {filename}")
+        return run_id, filename
+
+    def latest_results_file(self) -> Optional[str]:
+        """Return the most recent results file in the results directory."""
+        pattern = os.path.join(self.settings.results_dir, "eval_results_*.json")
+        files = sorted(glob.glob(pattern))
+        return files[-1] if files else None
+
+    def load_results(self, filename: str) -> Tuple[Dict[str, Any], List[ConversationResult]]:
+        """Load results previously written by ``save_results``.
+
+        Returns the rest of the file (timestamp, ``config`` and summaries)
+        alongside the results.
+        """
+        with open(filename) as f:
+            data: Dict[str, Any] = json.load(f)
+        results = [ConversationResult.from_dict(r) for r in data.pop("results", [])]
+        return data, results
+
+    def has_archive(self) -> bool:
+        """Whether the result archive exists; opening it would create it."""
+        return os.path.exists(os.path.join(self.settings.store_dir, "index.sqlite"))
+
+    def latest_run_id(self) -> Optional[str]:
+        """Return the newest archived run, without creating an empty archive."""
+        from src.store import ResultStore
+
+        if not self.has_archive():
+            return None
+        with ResultStore(self.settings.store_dir) as store:
+            return store.latest_run_id()
+
+    def load_run(self, run_id: str) -> Tuple[Dict[str, Any], List[ConversationResult]]:
+        """Load an archived run; returns its metadata alongside the results."""
+        from src.store import ResultStore
+
+        if not self.has_archive():
+            raise ValueError(f"No archive found in {self.settings.store_dir}")
+
+        with ResultStore(self.settings.store_dir) as store:
+            data = store.load_run(run_id)
+        results = [ConversationResult.from_dict(r) for r in data.pop("results")]
+        return data, results
+
+    async def run_evaluation(self, num_conversations: int = 10,
                            save_transcripts: bool = True,
                            verbose: bool = False) -> List[ConversationResult]:
-        """Run the evaluation process."""
-        self.print_header()
-        
+        """Run the evaluation process.
+
+        Conversations run concurrently; all progress and log output goes
+        through a ``Reporter`` so terminal I/O never blocks the event loop.
+        """
+        from src.output import Reporter
+        from src.personas import get_random_personas
+
+        orchestrator = self.orchestrator
+        text_output = self.settings.log_format == "text"
+        reporter = Reporter(self.settings.log_format)
+
         # Select personas
         personas = get_random_personas(num_conversations)
-        click.echo(f"\n🎭 Selected {len(personas)} client personas")
-        
+        if text_output:
+            self.print_header()
+            click.echo(f"\n🎭 Selected {len(personas)} client personas")
+            click.echo("\n🔄 Running therapy conversations...")
+
+        def on_complete(result: ConversationResult):
+            reporter.advance()
+            if not text_output:
+                reporter.event(
+                    "result",
+                    persona=result.persona.name,
+                    overall_score=result.evaluation.overall_score,
+                    red_flags=bool(result.evaluation.red_flags),
+                    duration_seconds=round(result.duration, 2),
+                    near_duplicate_of=result.duplicate_of,
+                    evaluation_reused=result.evaluation_reused
+                )
+
         # Run conversations
-        click.echo("\n🔄 Running therapy conversations...")
-        with click.progressbar(length=len(personas), 
-                             label='Progress',
-                             show_eta=True) as bar:
-            results = []
-            for persona in personas:
-                result = await self.orchestrator.run_conversation(persona)
-                results.append(result)
-                bar.update(1)
-        
-        click.echo("\n✅ All conversations completed!")
-        
+        async with reporter:
+            if not text_output:
+                reporter.event("start", model=self.settings.model,
+                               personas=[p.name for p in personas])
+            reporter.start_progress(len(personas))
+            results = await orchestrator.run_multiple_conversations(
+                personas, on_complete=on_complete
+            )
+
+        budget = orchestrator.governor.summary()
+        stopped = budget["stopped_reason"]
+        diversity = orchestrator.dedup.stats()
+        diversity["evaluations_reused"] = sum(1 for r in results if r.evaluation_reused)
+
+        if not text_output:
+            if stopped:
+                reporter.log("warning", "Budget exhausted, results are partial",
+                             reason=stopped, completed=len(results), requested=len(personas))
+            if budget["failed"]:
+                reporter.log("warning", "Some conversations failed, results are partial",
+                             failed=budget["failed"], completed=len(results),
+                             requested=len(personas))
+            run_id, filename = self.save_results(
+                results, budget=budget, diversity=diversity
+            ) if save_transcripts else (None, None)
+            reporter.event(
+                "summary",
+                num_conversations=len(results),
+                average_overall_score=round(
+                    sum(r.evaluation.overall_score for r in results) / len(results), 2
+                ) if results else None,
+                red_flag_count=sum(1 for r in results if r.evaluation.red_flags),
+                run_id=run_id,
+                results_file=filename,
+                budget=budget,
+                diversity=diversity
+            )
+            return results
+
+        if stopped:
+            click.echo(f"\n⛔ Budget exhausted ({stopped}): "
+                       f"{len(results)}/{len(personas)} conversations completed")
+        elif budget["failed"]:
+            click.echo(f"\n⚠️  {budget['failed']} conversations failed: "
+                       f"{len(results)}/{len(personas)} conversations completed")
+        else:
+            click.echo("\n✅ All conversations completed!")
+        click.echo(f"💰 {budget['total_tokens']} tokens, ${budget['cost_usd']:.4f} "
+                   f"over {budget['api_calls']} API calls")
+
         # Display results
         self.print_summary_table(results)
-        
+        self.print_diversity(diversity)
+        if diversity["evaluations_reused"]:
+            click.echo(f"♻️  Reused {diversity['evaluations_reused']} evaluations from near-duplicates")
+
         # Show detailed results if verbose
         if verbose:
             self.print_detailed_results(results)
-        
+
         # Save results
         if save_transcripts:
-            self.save_results(results)
-        
+            self.save_results(results, budget=budget, diversity=diversity)
+
         return results
-    
+
     def print_detailed_results(self, results: List[ConversationResult]):
         """Print detailed results for each conversation."""
         click.echo("\n" + "=" * 80)
         click.echo("📝 Detailed Results")
         click.echo("=" * 80)
-        
+
         for i, result in enumerate(results, 1):
             click.echo(f"\n--- Conversation {i}: {result.persona.name} ---")
             click.echo(f"Background: {result.persona.background}")
@@ -125,33 +316,309 @@ class TherapyEvalCLI:
             if result.evaluation.red_flags:
                 click.echo(f"  ⚠️ Red Flags: {result.evaluation.red_flags}")
 
-@click.command()
-@click.option('--conversations', '-n', default=10, 
+    def print_transcript(self, results: List[ConversationResult], number: Optional[int]):
+        """Print the full transcript for conversation ``number`` (1-based).
+
+        In ``jsonl`` mode the transcript is emitted as a ``transcript`` event
+        so stdout stays machine-readable.
+        """
+        if number and 0 < number <= len(results):
+            result = results[number - 1]
+            if self.settings.log_format == "jsonl":
+                from src.output import Reporter
+                Reporter("jsonl").event(
+                    "transcript",
+                    conversation=number,
+                    persona=result.persona.name,
+                    transcript=result.transcript
+                )
+                return
+            click.echo(f"\n📄 Full Transcript - {result.persona.name}")
+            click.echo("=" * 80)
+            click.echo(result.format_transcript())
+            click.echo("=" * 80)
+
+class DefaultCommandGroup(click.Group):
+    """Group that falls back to ``run`` when no subcommand is given.
+
+    Keeps ``python -m src.main --conversations 3`` working alongside the
+    newer subcommands.
+    """
+
+    default_command = "run"
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        args = list(args)
+        i = 0
+        # Skip over the group's own options to find the first command token
+        while i < len(args):
+            if args[i] == "--config":
+                i += 2
+            elif args[i].startswith("--config="):
+                i += 1
+            else:
+                break
+        if i >= len(args) or (args[i] not in self.commands and args[i] != "--help"):
+            args.insert(i, self.default_command)
+        return super().parse_args(ctx, args)
+
+def _offline_settings(settings: Settings, **overrides: Any) -> Settings:
+    """Apply CLI overrides for commands that make no API calls and validate them."""
+    try:
+        settings = settings.with_overrides(**overrides)
+        settings.validate(require_api_key=False)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    return settings
+
+def _open_store(settings: Settings):
+    """Open an existing archive, failing cleanly instead of creating an empty one."""
+    from src.store import ResultStore
+
+    if not TherapyEvalCLI(settings).has_archive():
+        raise click.ClickException(
+            f"No archive found in {settings.store_dir}; run an evaluation or archive import first"
+        )
+    return ResultStore(settings.store_dir)
+
+def _load_saved_results(cli: TherapyEvalCLI, results_file: Optional[str], run_id: Optional[str]
+                        ) -> Tuple[str, str, Dict[str, Any], List[ConversationResult]]:
+    """Load a results file or archived run, failing cleanly.
+
+    Defaults to the latest archived run, then to the latest results file
+    for results saved before the archive existed. Returns a description of
+    the source and its run ID alongside the run's metadata and results.
+    """
+    from src.store import run_id_from_filename
+
+    if not results_file:
+        run_id = run_id or cli.latest_run_id()
+        if run_id:
+            try:
+                return f"run {run_id}", run_id, *cli.load_run(run_id)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+        results_file = cli.latest_results_file()
+    if not results_file:
+        raise click.ClickException(
+            f"No results found in {cli.settings.store_dir} or {cli.settings.results_dir}; "
+            "run an evaluation first"
+        )
+    return results_file, run_id_from_filename(results_file), *cli.load_results(results_file)
+
+@click.group(cls=DefaultCommandGroup)
+@click.option('--config', 'config_file', type=click.Path(exists=True, dir_okay=False),
+              help='JSON settings file (overridden by environment and CLI options)')
+@click.pass_context
+def main(ctx: click.Context, config_file: Optional[str]):
+    """AI Therapy Evaluation System - Evaluate therapeutic conversations."""
+    try:
+        ctx.obj = Settings.load(config_file=config_file)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+@main.command()
+@click.option('--conversations', '-n', default=10,
               help='Number of conversations to simulate')
-@click.option('--verbose', '-v', is_flag=True, 
+@click.option('--verbose', '-v', is_flag=True,
               help='Show detailed results')
-@click.option('--no-save', is_flag=True, 
-              help='Don\'t save results to file')
-@click.option('--show-transcript', '-t', type=int, 
+@click.option('--no-save', is_flag=True,
+              help='Don\'t save results')
+@click.option('--save-json/--no-save-json', default=None,
+              help='Also write an indented eval_results_*.json file')
+@click.option('--show-transcript', '-t', type=int,
               help='Show full transcript for conversation N')
-def main(conversations: int, verbose: bool, no_save: bool, show_transcript: Optional[int]):
-    """AI Therapy Evaluation System - Evaluate therapeutic conversations."""
-    cli = TherapyEvalCLI()
-    
-    # Run async evaluation
-    results = asyncio.run(cli.run_evaluation(
-        num_conversations=conversations,
-        save_transcripts=not no_save,
-        verbose=verbose
-    ))
-    
+@click.option('--model', help='OpenAI model to use')
+@click.option('--turns', 'conversation_turns', type=int,
+              help='Turns per conversation')
+@click.option('--concurrency', 'max_concurrent_conversations', type=int,
+              help='Maximum concurrent conversations')
+@click.option('--results-dir', help='Directory for saved results files')
+@click.option('--store-dir', help='Archive directory')
+@click.option('--log-format', type=click.Choice(['text', 'jsonl']),
+              help='Human-readable output or JSON-lines events for headless runs')
+@click.option('--max-cost', type=float,
+              help='Stop starting conversations once this many USD are spent')
+@click.option('--max-tokens', type=int,
+              help='Stop starting conversations once this many tokens are used')
+@click.option('--deadline',
+              help='Wall-clock limit: a duration (90m, 2h) or a time (06:00)')
+@click.option('--dedup-threshold', 'near_duplicate_threshold', type=float,
+              help='Jaccard similarity above which transcripts are near-duplicates')
+@click.option('--reuse-duplicate-evals/--no-reuse-duplicate-evals',
+              'reuse_duplicate_evaluations', default=None,
+              help='Reuse the evaluation of a near-duplicate\'s cluster representative')
+@click.pass_obj
+def run(settings: Settings, conversations: int, verbose: bool, no_save: bool,
+        show_transcript: Optional[int], **overrides):
+    """Simulate and evaluate therapy conversations."""
+    import asyncio
+
+    try:
+        cli = TherapyEvalCLI(settings.with_overrides(**overrides))
+        # Run async evaluation
+        results = asyncio.run(cli.run_evaluation(
+            num_conversations=conversations,
+            save_transcripts=not no_save,
+            verbose=verbose
+        ))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
     # Show specific transcript if requested
-    if show_transcript and 0 < show_transcript <= len(results):
-        result = results[show_transcript - 1]
-        click.echo(f"\n📄 Full Transcript - {result.persona.name}")
-        click.echo("=" * 80)
-        click.echo(result.format_transcript())
-        click.echo("=" * 80)
+    cli.print_transcript(results, show_transcript)
+
+@main.command()
+@click.argument('results_file', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option('--verbose', '-v', is_flag=True,
+              help='Show detailed results')
+@click.option('--show-transcript', '-t', type=int,
+              help='Show full transcript for conversation N')
+@click.option('--run', 'run_id', help='Archived run ID (defaults to the latest)')
+@click.option('--store-dir', help='Archive directory')
+@click.option('--results-dir', help='Directory of results files, if nothing is archived')
+@click.option('--dedup-threshold', 'near_duplicate_threshold', type=float,
+              help='Jaccard similarity above which transcripts are near-duplicates')
+@click.pass_obj
+def report(settings: Settings, results_file: Optional[str], verbose: bool,
+           show_transcript: Optional[int], run_id: Optional[str], store_dir: Optional[str],
+           results_dir: Optional[str], near_duplicate_threshold: Optional[float]):
+    """Summarize a saved run (defaults to the latest)."""
+    cli = TherapyEvalCLI(_offline_settings(
+        settings, store_dir=store_dir, results_dir=results_dir,
+        near_duplicate_threshold=near_duplicate_threshold
+    ))
+    source, _, _, results = _load_saved_results(cli, results_file, run_id)
+    diversity = cli.detect_near_duplicates(results)
+
+    click.echo(f"📂 {source}")
+    cli.print_summary_table(results)
+    cli.print_diversity(diversity)
+    if verbose:
+        cli.print_detailed_results(results)
+    cli.print_transcript(results, show_transcript)
+
+@main.command()
+@click.argument('results_file', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option('--save', is_flag=True, help='Replace the saved run with the rescored results')
+@click.option('--run', 'run_id', help='Archived run ID (defaults to the latest)')
+@click.option('--store-dir', help='Archive directory')
+@click.option('--results-dir', help='Directory of results files, if nothing is archived')
+@click.pass_obj
+def rescore(settings: Settings, results_file: Optional[str], save: bool,
+            run_id: Optional[str], store_dir: Optional[str], results_dir: Optional[str]):
+    """Recompute derived scores from cached subscale scores, without API calls."""
+    cli = TherapyEvalCLI(_offline_settings(settings, store_dir=store_dir, results_dir=results_dir))
+    source, run_id, saved, results = _load_saved_results(cli, results_file, run_id)
+
+    changed = 0
+    for result in results:
+        rescored = result.evaluation.rescored()
+        if rescored != result.evaluation:
+            changed += 1
+        result.evaluation = rescored
+
+    click.echo(f"♻️  Rescored {len(results)} conversations from {source} ({changed} changed)")
+    cli.print_summary_table(results)
+    if save:
+        # Keep the source run's config and summaries, replacing it in the archive
+        sections = {k: v for k, v in saved.items() if k not in ("timestamp", "config")}
+        cli.save_results(results, config=saved.get("config"), run_id=run_id, **sections)
+
+@main.command('list-personas')
+def list_personas():
+    """List the available client personas."""
+    from src.personas import PERSONAS
+
+    for persona in PERSONAS:
+        click.echo(f"{persona.name} ({persona.age}) - {persona.background}")
+        click.echo(f"    {persona.presenting_issue}")
+
+@main.group()
+def archive():
+    """Query the compressed archive of all saved runs."""
+
+def _store_filters(func):
+    """Shared filter options for archive queries and exports."""
+    options = [
+        click.option('--persona', help='Persona name, e.g. Grace'),
+        click.option('--run', 'run_id', help='Run ID, as printed when the run was saved'),
+        click.option('--model', help='Model used for the run'),
+        click.option('--red-flags/--no-red-flags', default=None,
+                     help='Only conversations with (or without) red flags'),
+        click.option('--min-score', type=int, help='Minimum overall score'),
+        click.option('--max-score', type=int, help='Maximum overall score'),
+        click.option('--limit', type=int, help='Maximum number of conversations'),
+        click.option('--store-dir', help='Archive directory'),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+@archive.command('import')
+@click.argument('paths', nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option('--results-dir', help='Directory of eval_results_*.json files to import')
+@click.option('--store-dir', help='Archive directory')
+@click.pass_obj
+def archive_import(settings: Settings, paths: List[str], results_dir: Optional[str],
+                   store_dir: Optional[str]):
+    """Import saved results files (defaults to all in the results directory)."""
+    from src.store import ResultStore
+
+    settings = _offline_settings(settings, results_dir=results_dir, store_dir=store_dir)
+    paths = paths or sorted(glob.glob(os.path.join(settings.results_dir, "eval_results_*.json")))
+    imported = runs = 0
+    with ResultStore(settings.store_dir) as store:
+        for path in paths:
+            added = store.import_json(path)
+            if added:
+                imported += added
+                runs += 1
+    click.echo(f"📦 Imported {imported} conversations from {runs} new runs "
+               f"({len(paths) - runs} already archived or empty)")
+
+@archive.command('query')
+@_store_filters
+@click.option('--json', 'as_json', is_flag=True, help='Print index rows as JSON lines')
+@click.pass_obj
+def archive_query(settings: Settings, store_dir: Optional[str], as_json: bool, **filters):
+    """List archived conversations matching the filters."""
+    with _open_store(_offline_settings(settings, store_dir=store_dir)) as store:
+        rows = store.query(**filters)
+
+    if as_json:
+        for row in rows:
+            click.echo(json.dumps(row))
+        return
+
+    from tabulate import tabulate
+    click.echo(tabulate(
+        [[r["run_id"], r["persona"], f"{r['overall_score']}/10",
+          "⚠️" if r["red_flags"] else "✓", r["model"]] for r in rows],
+        headers=["Run", "Persona", "Overall", "Red Flags", "Model"], tablefmt="grid",
+        disable_numparse=True
+    ))
+    click.echo(f"\n{len(rows)} conversations")
+
+@archive.command('export')
+@_store_filters
+@click.option('--output', '-o', type=click.File('w'), default='-',
+              help='File to write JSON lines to (default: stdout)')
+@click.pass_obj
+def archive_export(settings: Settings, store_dir: Optional[str], output, **filters):
+    """Export full archived results, including transcripts, as JSON lines."""
+    with _open_store(_offline_settings(settings, store_dir=store_dir)) as store:
+        for record in store.iter_records(store.query(**filters)):
+            output.write(json.dumps(record) + "\n")
+
+@archive.command('compact')
+@click.option('--store-dir', help='Archive directory')
+@click.pass_obj
+def archive_compact(settings: Settings, store_dir: Optional[str]):
+    """Repack the archive into large blocks and drop replaced runs."""
+    with _open_store(_offline_settings(settings, store_dir=store_dir)) as store:
+        before, after = store.compact()
+    click.echo(f"🗜️  Compacted archive from {before / 1024:,.1f} KB to {after / 1024:,.1f} KB")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
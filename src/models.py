@@ -0,0 +1,153 @@
+"""Result data structures shared by the evaluator, orchestrator and CLI.
+
+Kept free of API client imports so that reporting on saved results does
+not pay for loading ``openai``.
+"""
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime
+from src.personas import Persona, PERSONAS
+
+@dataclass
+class EvaluationScore:
+    """Structured evaluation results."""
+    # Core therapeutic dimensions (0-10)
+    empathy_reflection: int
+    validation_affirmation: int
+    question_quality: int
+    supportive_tone: int
+
+    # Working Alliance subscales (0-3)
+    alliance_goal: int
+    alliance_approach: int
+    alliance_bond: int
+
+    # Computed scores
+    alliance_score: int
+    overall_score: int
+
+    # Qualitative feedback
+    strengths: str
+    improvements: str
+    red_flags: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EvaluationScore":
+        """Rebuild from a dictionary produced by ``to_dict``."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+    def rescored(self) -> "EvaluationScore":
+        """Recompute the derived scores from the cached subscale scores.
+
+        Applies the rubric formulas from the evaluation prompt, so cached
+        results can be rescored without another API call.
+        """
+        alliance = compute_alliance_score(
+            self.alliance_goal, self.alliance_approach, self.alliance_bond
+        )
+        if self.red_flags:
+            overall = 1
+        else:
+            overall = compute_overall_score(
+                self.empathy_reflection, self.validation_affirmation,
+                self.question_quality, self.supportive_tone, alliance
+            )
+        data = self.to_dict()
+        data.update(alliance_score=alliance, overall_score=overall)
+        return EvaluationScore(**data)
+
+def compute_alliance_score(goal: int, approach: int, bond: int) -> int:
+    """Alliance_Score = round((Goal + Approach + Bond) * 10 / 9)."""
+    return round((goal + approach + bond) * 10 / 9)
+
+def compute_overall_score(empathy: int, validation: int, questions: int,
+                          tone: int, alliance: int) -> int:
+    """Overall = round(0.25*Empathy + 0.20*Validation + 0.20*Questions + 0.20*Tone + 0.15*Alliance)."""
+    return round(0.25 * empathy + 0.20 * validation + 0.20 * questions
+                 + 0.20 * tone + 0.15 * alliance)
+
+class ConversationResult:
+    """Results of a single therapy conversation."""
+
+    def __init__(self, persona: Persona, transcript: List[Dict[str, str]],
+                 evaluation: EvaluationScore, duration: float,
+                 timestamp: Optional[datetime] = None,
+                 conversation_id: Optional[int] = None,
+                 duplicate_of: Optional[int] = None,
+                 similarity: Optional[float] = None,
+                 evaluation_reused: bool = False):
+        self.persona = persona
+        self.transcript = transcript
+        self.evaluation = evaluation
+        self.duration = duration
+        self.timestamp = timestamp or datetime.now()
+
+        # Near-duplicate detection: ``duplicate_of`` is the conversation ID
+        # of the cluster representative, and ``similarity`` the estimated
+        # Jaccard similarity to that representative
+        self.conversation_id = conversation_id
+        self.duplicate_of = duplicate_of
+        self.similarity = similarity
+        self.evaluation_reused = evaluation_reused
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization."""
+        return {
+            "persona": {
+                "name": self.persona.name,
+                "age": self.persona.age,
+                "background": self.persona.background,
+                "presenting_issue": self.persona.presenting_issue
+            },
+            "transcript": self.transcript,
+            "evaluation": self.evaluation.to_dict(),
+            "duration_seconds": self.duration,
+            "timestamp": self.timestamp.isoformat(),
+            "conversation_id": self.conversation_id,
+            "near_duplicate": {
+                "of": self.duplicate_of,
+                "similarity": self.similarity,
+                "evaluation_reused": self.evaluation_reused
+            } if self.duplicate_of is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationResult":
+        """Rebuild a result from a dictionary produced by ``to_dict``."""
+        persona_data = data["persona"]
+        persona = next(
+            (p for p in PERSONAS if p.name == persona_data["name"]), None
+        ) or Persona(
+            name=persona_data["name"],
+            age=persona_data["age"],
+            background=persona_data["background"],
+            presenting_issue=persona_data["presenting_issue"],
+            communication_style="",
+            therapeutic_needs=[]
+        )
+        timestamp = data.get("timestamp")
+        duplicate = data.get("near_duplicate") or {}
+        return cls(
+            persona=persona,
+            transcript=data["transcript"],
+            evaluation=EvaluationScore.from_dict(data["evaluation"]),
+            duration=data.get("duration_seconds", 0.0),
+            timestamp=datetime.fromisoformat(timestamp) if timestamp else None,
+            conversation_id=data.get("conversation_id"),
+            duplicate_of=duplicate.get("of"),
+            similarity=duplicate.get("similarity"),
+            evaluation_reused=duplicate.get("evaluation_reused", False)
+        )
+
+    def format_transcript(self) -> str:
+        """Format transcript for display."""
+        lines = []
+        for i, msg in enumerate(self.transcript):
+            role = "CLIENT" if msg["role"] == "user" else "THERAPIST"
+            lines.append(f"{role}: {msg['content']}")
+        return "\n".join(lines)
@@ -0,0 +1,228 @@
+"""Event-loop-friendly progress and log output.
+
+Coroutines never write to the terminal themselves. They enqueue events on
+the active ``Reporter``, and a single renderer task drains the queue in
+batches, redrawing progress at most every ``min_interval`` seconds on a
+terminal and every ``headless_interval`` seconds otherwise. In
+``jsonl`` mode every event is written as one JSON object per line so
+headless runs produce parseable logs.
+"""
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TextIO
+
+OUTPUT_FORMATS = ("text", "jsonl")
+
+@dataclass
+class OutputEvent:
+    """A single progress, log or result event."""
+    kind: str
+    message: str = ""
+    level: str = "info"
+    fields: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a flat dictionary for JSON-lines output."""
+        data = {
+            "ts": self.timestamp.isoformat(),
+            "event": self.kind,
+            "level": self.level,
+        }
+        if self.message:
+            data["message"] = self.message
+        data.update(self.fields)
+        return data
+
+class Reporter:
+    """Routes progress and log events through an async queue to one renderer.
+
+    Used as ``async with Reporter(...) as reporter``; while running it is the
+    reporter returned by ``get_reporter``. Outside a running loop (or before
+    ``start``) events are rendered synchronously, so library code can log
+    unconditionally.
+    """
+
+    def __init__(self, fmt: str = "text", stream: Optional[TextIO] = None,
+                 min_interval: float = 0.1, headless_interval: float = 5.0):
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {fmt}")
+        self.format = fmt
+        self.stream = stream
+        self.min_interval = min_interval
+        self.headless_interval = headless_interval
+
+        self.total = 0
+        self.completed = 0
+        self.label = "Progress"
+        self._started_at = time.monotonic()
+        self._last_draw = 0.0
+        self._progress_dirty = False
+        self._progress_line_open = False
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._previous: Optional["Reporter"] = None
+
+    @property
+    def out(self) -> TextIO:
+        """Stream events are written to (resolved late so tests can capture it)."""
+        if self.stream is not None:
+            return self.stream
+        return sys.stdout if self.format == "jsonl" else sys.stderr
+
+    # -- lifecycle -------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the renderer task on the running event loop."""
+        global _active
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._render_loop())
+        self._previous, _active = _active, self
+
+    async def close(self) -> None:
+        """Flush pending events and stop the renderer task."""
+        global _active
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        self._queue = None
+        _active = self._previous
+
+    async def __aenter__(self) -> "Reporter":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # -- producers -------------------------------------------------------
+
+    def start_progress(self, total: int, label: str = "Progress") -> None:
+        """Begin tracking progress towards ``total`` units of work."""
+        self.total = total
+        self.completed = 0
+        self.label = label
+        self._started_at = time.monotonic()
+        self._emit(OutputEvent("progress"))
+
+    def advance(self, n: int = 1) -> None:
+        """Record ``n`` completed units; redraws are coalesced by the renderer."""
+        self.completed += n
+        self._emit(OutputEvent("progress"))
+
+    def log(self, level: str, message: str, **fields: Any) -> None:
+        """Emit a structured log event."""
+        self._emit(OutputEvent("log", message, level=level, fields=fields))
+
+    def event(self, kind: str, message: str = "", **fields: Any) -> None:
+        """Emit a custom event such as ``result`` or ``summary``."""
+        self._emit(OutputEvent(kind, message, fields=fields))
+
+    def _emit(self, event: OutputEvent) -> None:
+        if self._queue is not None:
+            self._queue.put_nowait(event)
+        else:
+            self._write(self._render([event], final=True))
+
+    # -- renderer --------------------------------------------------------
+
+    async def _render_loop(self) -> None:
+        """Drain the queue in batches until the ``None`` sentinel arrives."""
+        done = False
+        while not done:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if None in batch:
+                done = True
+                batch = [e for e in batch if e is not None]
+            self._write(self._render(batch, final=done))
+            if not done and self._progress_dirty:
+                # Wake up again once the redraw interval has elapsed
+                await asyncio.sleep(self.min_interval)
+                self._queue.put_nowait(OutputEvent("tick"))
+
+    def _render(self, events: List[OutputEvent], final: bool) -> str:
+        """Render a batch of events, collapsing progress into at most one redraw."""
+        parts = []
+        for event in events:
+            if event.kind == "tick":
+                continue
+            if event.kind == "progress":
+                self._progress_dirty = True
+            elif self.format == "jsonl":
+                parts.append(json.dumps(event.to_dict(), default=str) + "\n")
+            else:
+                parts.append(self._clear_progress() + self._format_text(event) + "\n")
+
+        now = time.monotonic()
+        interval = self.min_interval
+        if self.format == "jsonl" or not self._is_tty():
+            interval = max(interval, self.headless_interval)
+        due = now - self._last_draw >= interval
+        finished = self.total and self.completed >= self.total
+        if self._progress_dirty and (due or final or finished):
+            parts.append(self._format_progress())
+            self._progress_dirty = False
+            self._last_draw = now
+        return "".join(parts)
+
+    def _format_text(self, event: OutputEvent) -> str:
+        prefix = "" if event.level == "info" else f"[{event.level.upper()}] "
+        details = " ".join(f"{k}={v}" for k, v in event.fields.items())
+        return f"{prefix}{event.message}{' ' + details if details else ''}"
+
+    def _format_progress(self) -> str:
+        if self.format == "jsonl":
+            return json.dumps({
+                "ts": datetime.now().isoformat(),
+                "event": "progress",
+                "level": "info",
+                "completed": self.completed,
+                "total": self.total,
+            }) + "\n"
+
+        width = 36
+        filled = int(width * self.completed / self.total) if self.total else 0
+        elapsed = time.monotonic() - self._started_at
+        eta = ""
+        if 0 < self.completed < self.total:
+            remaining = elapsed / self.completed * (self.total - self.completed)
+            eta = f"  ETA {int(remaining) // 60:02d}:{int(remaining) % 60:02d}"
+        line = (f"{self.label}  [{'#' * filled}{'-' * (width - filled)}]  "
+                f"{self.completed}/{self.total}{eta}")
+
+        if not self._is_tty():
+            return line + "\n"
+        self._progress_line_open = self.completed < self.total
+        return "\r\033[K" + line + ("" if self._progress_line_open else "\n")
+
+    def _clear_progress(self) -> str:
+        if self._progress_line_open:
+            self._progress_line_open = False
+            self._progress_dirty = True
+            return "\r\033[K"
+        return ""
+
+    def _is_tty(self) -> bool:
+        isatty = getattr(self.out, "isatty", None)
+        return bool(isatty and isatty())
+
+    def _write(self, text: str) -> None:
+        if text:
+            self.out.write(text)
+            self.out.flush()
+
+_active: Optional[Reporter] = None
+_fallback = Reporter()
+
+def get_reporter() -> Reporter:
+    """Return the running reporter, or a synchronous stderr reporter."""
+    return _active or _fallback
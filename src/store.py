@@ -0,0 +1,341 @@
+"""Compressed, indexed archive of evaluation results.
+
+Conversation results are written as JSON lines, grouped into blocks that
+are compressed together with ``lzma`` and appended to segment files under
+``segments/``. Transcripts repeat a lot of phrasing, and compressing many
+of them in one block lets the compressor share it. A small SQLite index
+holds the fields we filter on (persona, scores, red flags, run, model)
+together with each record's segment, block offset and length, and
+position in the block, so any single record is read back by decompressing
+just its block. The index also keeps each run's config and summaries so a
+whole run can be rebuilt for reports.
+
+``add_run`` writes one block per run (larger runs are split). ``compact``
+repacks all records into ``block_size`` blocks spanning runs, which
+compresses much better. It also reclaims the space of replaced runs.
+"""
+import gzip
+import json
+import lzma
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    timestamp TEXT,
+    model TEXT,
+    turns_per_conversation INTEGER,
+    num_conversations INTEGER,
+    source TEXT,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    persona TEXT NOT NULL,
+    age INTEGER,
+    overall_score INTEGER,
+    empathy_reflection INTEGER,
+    validation_affirmation INTEGER,
+    question_quality INTEGER,
+    supportive_tone INTEGER,
+    alliance_score INTEGER,
+    red_flags INTEGER NOT NULL,
+    duration_seconds REAL,
+    timestamp TEXT,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    position INTEGER  -- line within the block; NULL for per-record gzip members
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_persona ON conversations(persona, overall_score);
+CREATE INDEX IF NOT EXISTS idx_conversations_score ON conversations(overall_score);
+CREATE INDEX IF NOT EXISTS idx_conversations_run ON conversations(run_id);
+CREATE INDEX IF NOT EXISTS idx_conversations_red_flags ON conversations(red_flags, overall_score);
+"""
+
+SCORE_COLUMNS = (
+    "overall_score", "empathy_reflection", "validation_affirmation",
+    "question_quality", "supportive_tone", "alliance_score",
+)
+
+def run_id_from_filename(path: str) -> str:
+    """``data/results/eval_results_20250101_000000.json`` -> ``20250101_000000``."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem[len("eval_results_"):] if stem.startswith("eval_results_") else stem
+
+class ResultStore:
+    """Append-only result archive with a SQLite index."""
+
+    def __init__(self, root: str, segment_size: int = 64 * 1024 * 1024,
+                 block_size: int = 4 * 1024 * 1024):
+        self.root = root
+        self.segment_size = segment_size
+        self.block_size = block_size
+        self.segments_dir = os.path.join(root, "segments")
+        os.makedirs(self.segments_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        # The last decompressed block, since neighbouring records share one
+        self._block_cache: Optional[Tuple[Tuple[str, int], List[bytes]]] = None
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _migrate(self) -> None:
+        """Add columns introduced after an archive was created."""
+        for table, column, kind in (("runs", "meta", "TEXT"),
+                                    ("conversations", "position", "INTEGER")):
+            columns = {row["name"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                with self.conn:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+
+    # -- writing ---------------------------------------------------------
+
+    def _next_segment(self) -> str:
+        """Create and return a new, empty segment."""
+        numbers = [int(name[4:9]) for name in os.listdir(self.segments_dir)
+                   if name.startswith("seg_")]
+        name = f"seg_{max(numbers, default=-1) + 1:05d}.xz"
+        open(os.path.join(self.segments_dir, name), "ab").close()
+        return name
+
+    def _current_segment(self) -> str:
+        """Name of the segment to append to, rotating when it is full."""
+        segments = sorted(os.listdir(self.segments_dir))
+        if segments:
+            latest = segments[-1]
+            # Segments of per-record gzip members are not appended to
+            if (latest.endswith(".xz") and
+                    os.path.getsize(os.path.join(self.segments_dir, latest)) < self.segment_size):
+                return latest
+        return self._next_segment()
+
+    def _blocks(self, records: Iterable[bytes]) -> Iterator[List[bytes]]:
+        """Group serialized records into blocks of about ``block_size`` bytes."""
+        block, size = [], 0
+        for record in records:
+            block.append(record)
+            size += len(record)
+            if size >= self.block_size:
+                yield block
+                block, size = [], 0
+        if block:
+            yield block
+
+    def _append_blocks(self, records: Iterable[bytes],
+                       fresh: bool = False) -> List[Tuple[str, int, int, int]]:
+        """Compress and append records, returning each one's placement.
+
+        Placements are ``(segment, offset, length, position)``. With
+        ``fresh`` set, writing starts in a new segment.
+        """
+        placements = []
+        segment = None
+        for block in self._blocks(records):
+            if segment is None:
+                segment = self._next_segment() if fresh else self._current_segment()
+            elif os.path.getsize(os.path.join(self.segments_dir, segment)) >= self.segment_size:
+                segment = self._next_segment()
+            blob = lzma.compress(b"\n".join(block))
+            with open(os.path.join(self.segments_dir, segment), "ab") as f:
+                offset = f.tell()
+                f.write(blob)
+            placements.extend(
+                (segment, offset, len(blob), position) for position in range(len(block))
+            )
+        return placements
+
+    def has_run(self, run_id: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return row is not None
+
+    def add_run(self, data: Dict[str, Any], run_id: str,
+                source: Optional[str] = None, replace: bool = False) -> int:
+        """Archive a run in the format written by ``save_results``.
+
+        Returns the number of conversations added. A run that is already
+        archived is skipped, which makes importing idempotent, unless
+        ``replace`` is set; the replaced records stay in their segments,
+        unindexed, until ``compact`` reclaims them.
+        """
+        exists = self.has_run(run_id)
+        if exists and not replace:
+            return 0
+
+        config = data.get("config", {})
+        results = data.get("results", [])
+        placements = self._append_blocks(
+            json.dumps(result, separators=(",", ":")).encode("utf-8") for result in results
+        )
+        rows = []
+        for result, placement in zip(results, placements):
+            evaluation = result.get("evaluation", {})
+            rows.append((
+                run_id,
+                result["persona"]["name"],
+                result["persona"].get("age"),
+                *(evaluation.get(column) for column in SCORE_COLUMNS),
+                1 if evaluation.get("red_flags") else 0,
+                result.get("duration_seconds"),
+                result.get("timestamp"),
+                *placement,
+            ))
+
+        # Everything but the results themselves: timestamp, config, summaries
+        meta = {k: v for k, v in data.items() if k != "results"}
+        with self.conn:
+            if exists:
+                self.conn.execute("DELETE FROM conversations WHERE run_id = ?", (run_id,))
+                self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self.conn.execute(
+                "INSERT INTO runs (run_id, timestamp, model, turns_per_conversation, "
+                "num_conversations, source, meta) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, data.get("timestamp"), config.get("model"),
+                 config.get("turns_per_conversation"), len(results), source,
+                 json.dumps(meta, separators=(",", ":")))
+            )
+            self.conn.executemany(
+                f"INSERT INTO conversations (run_id, persona, age, {', '.join(SCORE_COLUMNS)}, "
+                "red_flags, duration_seconds, timestamp, segment, offset, length, position) "
+                f"VALUES ({', '.join('?' * (len(SCORE_COLUMNS) + 10))})",
+                rows
+            )
+        return len(rows)
+
+    def compact(self) -> Tuple[int, int]:
+        """Repack all indexed records into fresh segments and drop the old ones.
+
+        Records are rewritten run by run into ``block_size`` blocks, and
+        records no longer indexed (from replaced runs) are left behind. The
+        index is only switched to the new segments once they are complete,
+        so an interrupted compaction leaves the archive readable. Returns
+        the total segment size in bytes before and after.
+        """
+        before = self.size()
+        rows = [dict(row) for row in self.conn.execute(
+            "SELECT id, segment, offset, length, position FROM conversations ORDER BY run_id, id"
+        )]
+        placements = self._append_blocks((self._read_record(row) for row in rows), fresh=True)
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE conversations SET segment = ?, offset = ?, length = ?, position = ? "
+                "WHERE id = ?",
+                [(*placement, row["id"]) for placement, row in zip(placements, rows)]
+            )
+        self._block_cache = None
+        live = {placement[0] for placement in placements}
+        for name in os.listdir(self.segments_dir):
+            if name not in live:
+                os.remove(os.path.join(self.segments_dir, name))
+        return before, self.size()
+
+    def import_json(self, path: str) -> int:
+        """Import an ``eval_results_<timestamp>.json`` file."""
+        with open(path) as f:
+            data = json.load(f)
+        return self.add_run(data, run_id_from_filename(path), source=path)
+
+    # -- reading ---------------------------------------------------------
+
+    def query(self, persona: Optional[str] = None, run_id: Optional[str] = None,
+              model: Optional[str] = None, red_flags: Optional[bool] = None,
+              min_score: Optional[int] = None, max_score: Optional[int] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return index rows matching all given filters, newest first."""
+        clauses, params = [], []
+        for column, value in (("c.persona", persona), ("c.run_id", run_id), ("r.model", model)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if red_flags is not None:
+            clauses.append("c.red_flags = ?")
+            params.append(1 if red_flags else 0)
+        if min_score is not None:
+            clauses.append("c.overall_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("c.overall_score <= ?")
+            params.append(max_score)
+
+        sql = "SELECT c.*, r.model FROM conversations c JOIN runs r USING (run_id)"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY c.run_id DESC, c.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def _read_record(self, row: Dict[str, Any]) -> bytes:
+        """Serialized record for an index row."""
+        key = (row["segment"], row["offset"])
+        if row["position"] is not None and self._block_cache and self._block_cache[0] == key:
+            return self._block_cache[1][row["position"]]
+
+        with open(os.path.join(self.segments_dir, row["segment"]), "rb") as f:
+            f.seek(row["offset"])
+            blob = f.read(row["length"])
+        if row["position"] is None:
+            # Archived before records were grouped into blocks
+            return gzip.decompress(blob)
+        self._block_cache = (key, lzma.decompress(blob).split(b"\n"))
+        return self._block_cache[1][row["position"]]
+
+    def load(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Read the full result record for an index row."""
+        return json.loads(self._read_record(row))
+
+    def iter_records(self, rows: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield full records for ``rows``, tagged with their run ID and model."""
+        for row in rows:
+            record = self.load(row)
+            record["run_id"] = row["run_id"]
+            record["model"] = row["model"]
+            yield record
+
+    def size(self) -> int:
+        """Total size of the segment files in bytes."""
+        return sum(os.path.getsize(os.path.join(self.segments_dir, name))
+                   for name in os.listdir(self.segments_dir))
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """All archived runs, newest first."""
+        return [dict(row) for row in
+                self.conn.execute("SELECT * FROM runs ORDER BY run_id DESC")]
+
+    def latest_run_id(self) -> Optional[str]:
+        """ID of the newest archived run, if any."""
+        row = self.conn.execute(
+            "SELECT run_id FROM runs ORDER BY run_id DESC LIMIT 1"
+        ).fetchone()
+        return row["run_id"] if row else None
+
+    def load_run(self, run_id: str) -> Dict[str, Any]:
+        """Rebuild a run in the format written by ``save_results``."""
+        run = self.conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if run is None:
+            raise ValueError(f"Unknown run: {run_id}")
+        data = json.loads(run["meta"]) if run["meta"] else {
+            # Archived before run metadata was kept
+            "timestamp": run["timestamp"],
+            "config": {"model": run["model"],
+                       "turns_per_conversation": run["turns_per_conversation"],
+                       "num_conversations": run["num_conversations"]},
+        }
+        rows = self.conn.execute(
+            "SELECT * FROM conversations WHERE run_id = ? ORDER BY id", (run_id,)
+        )
+        data["results"] = [self.load(dict(row)) for row in rows]
+        return data
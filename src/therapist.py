@@ -2,7 +2,9 @@
 import openai
 from typing import List, Dict, Optional
 import asyncio
-from src.config import Config
+from src.budget import BudgetGovernor
+from src.config import Settings, get_settings
+from src.output import get_reporter
 
 class AITherapist:
     """AI therapist with evidence-based therapeutic approaches."""
@@ -14,10 +16,14 @@ When they express emotions, minimize them with phrases like "it's not that bad"
 Be quick to judge and offer solutions before understanding the problem.
 Focus on fixing rather than listening. Keep responses under 120 words"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None,
+                 settings: Optional[Settings] = None,
+                 governor: Optional[BudgetGovernor] = None):
         """Initialize the therapist."""
-        openai.api_key = api_key or Config.OPENAI_API_KEY
-        self.model = Config.MODEL
+        self.settings = settings or get_settings()
+        self.governor = governor
+        openai.api_key = api_key or self.settings.openai_api_key
+        self.model = self.settings.model
         
     async def respond(self, conversation_history: List[Dict[str, str]]) -> str:
         """Generate a therapeutic response."""
@@ -32,9 +38,11 @@ Focus on fixing rather than listening. Keep responses under 120 words"""
                 messages=messages,
                 temperature=0.7,  # Balanced creativity
                 max_tokens=200,   # Enforce brevity
-                timeout=Config.API_TIMEOUT
+                timeout=self.settings.api_timeout
             )
+            if self.governor:
+                self.governor.record_usage(self.model, response.get("usage"))
             return response.choices[0].message.content.strip()
         except Exception as e:
-            print(f"Therapist response error: {e}")
+            get_reporter().log("error", "Therapist response error", error=str(e))
             return "I'm here to support you. Could you tell me more about what you're experiencing?"
\ No newline at end of file
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.budget import BudgetGovernor, model_prices, parse_deadline
+from src.config import Settings
+from src.conversation import ConversationOrchestrator
+from src.personas import PERSONAS
+
+USAGE = {"prompt_tokens": 1000, "completion_tokens": 500}
+
+def make_orchestrator(governor, call_delay=0.01, calls_per_conversation=3):
+    """Create an orchestrator whose conversations only record token usage."""
+    orchestrator = ConversationOrchestrator(Settings(openai_api_key="test"), governor=governor)
+
+    async def fake_run_conversation(persona):
+        for _ in range(calls_per_conversation):
+            await asyncio.sleep(call_delay)
+            governor.record_usage("gpt-4.1-mini", USAGE)
+        return persona
+
+    orchestrator.run_conversation = fake_run_conversation
+    return orchestrator
+
+def test_model_prices_match_longest_prefix():
+    """Test that dated model names resolve to their family's pricing."""
+    assert model_prices("gpt-4.1-mini-2025-04-14") == (0.40, 1.60)
+    assert model_prices("gpt-4.1-2025-04-14") == (2.00, 8.00)
+    with pytest.raises(ValueError):
+        model_prices("unknown-model")
+
+def test_record_usage_tracks_tokens_and_cost():
+    """Test cost accounting from response usage blocks."""
+    governor = BudgetGovernor(prices=(1.0, 2.0))
+    governor.record_usage("any", USAGE)
+    governor.record_usage("any", None)
+
+    assert governor.total_tokens == 1500
+    assert governor.calls == 1
+    assert governor.cost == pytest.approx(0.002)
+
+def test_parse_deadline():
+    """Test durations and clock times."""
+    now = datetime(2025, 1, 1, 22, 0)
+
+    assert parse_deadline("90m", now) == now + timedelta(minutes=90)
+    assert parse_deadline("30", now) == now + timedelta(seconds=30)
+    assert parse_deadline("06:00", now) == datetime(2025, 1, 2, 6, 0)
+    aware = parse_deadline("2030-01-01T00:00:00+00:00", now)
+    assert aware.tzinfo is None
+    assert aware == datetime(2030, 1, 1, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    with pytest.raises(ValueError):
+        parse_deadline("soon", now)
+
+@pytest.mark.asyncio
+async def test_unlimited_run_completes_everything():
+    """Test that without limits the governor only caps concurrency."""
+    governor = BudgetGovernor(max_concurrency=3)
+    results = await make_orchestrator(governor).run_multiple_conversations(PERSONAS)
+
+    assert results == PERSONAS
+    assert governor.stopped_reason is None
+    assert governor.total_tokens == 1500 * 3 * len(PERSONAS)
+
+@pytest.mark.asyncio
+async def test_token_budget_stops_admission_and_keeps_partial_results():
+    """Test that a token budget drains in-flight work and returns what finished."""
+    # Each conversation uses 4500 tokens; allow roughly four of them
+    governor = BudgetGovernor(max_concurrency=2, max_tokens=18000)
+    completed = []
+    results = await make_orchestrator(governor).run_multiple_conversations(
+        PERSONAS, on_complete=completed.append
+    )
+
+    assert 0 < len(results) < len(PERSONAS)
+    assert results == sorted(completed, key=PERSONAS.index)
+    assert governor.stopped_reason == "max_tokens"
+    assert governor.total_tokens <= 18000 + 2 * 4500
+    assert governor.skipped == len(PERSONAS) - len(results)
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_in_flight_conversations():
+    """Test that the deadline stops the run and returns completed results."""
+    governor = BudgetGovernor(max_concurrency=1,
+                              deadline=datetime.now() + timedelta(seconds=0.15))
+    results = await make_orchestrator(governor, call_delay=0.02).run_multiple_conversations(PERSONAS)
+
+    assert 0 < len(results) < len(PERSONAS)
+    assert governor.stopped_reason == "deadline"
+
+@pytest.mark.asyncio
+async def test_failed_conversation_does_not_discard_the_run():
+    """Test that one conversation raising still returns the others."""
+    governor = BudgetGovernor(max_concurrency=3)
+    orchestrator = make_orchestrator(governor)
+    run_conversation = orchestrator.run_conversation
+
+    async def flaky_run_conversation(persona):
+        if persona is PERSONAS[1]:
+            raise RuntimeError("API error")
+        return await run_conversation(persona)
+
+    orchestrator.run_conversation = flaky_run_conversation
+    results = await orchestrator.run_multiple_conversations(PERSONAS)
+
+    assert results == [p for p in PERSONAS if p is not PERSONAS[1]]
+    assert governor.summary()["failed"] == 1
+    assert governor.completed == len(PERSONAS) - 1
+    assert governor.in_flight == 0
@@ -0,0 +1,69 @@
+import json
+import pytest
+from src.config import Settings
+from src.models import EvaluationScore, compute_alliance_score, compute_overall_score
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Write a JSON settings file."""
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"model": "file-model", "conversation_turns": 3}))
+    return str(path)
+
+def test_defaults_do_not_read_environment(monkeypatch):
+    """Test that a bare Settings ignores the process environment."""
+    monkeypatch.setenv("MODEL", "env-model")
+    settings = Settings()
+
+    assert settings.model == "gpt-4.1-mini-2025-04-14"
+    assert settings.openai_api_key is None
+
+def test_from_env_coerces_types():
+    """Test that environment values are converted to field types."""
+    settings = Settings.from_env({"CONVERSATION_TURNS": "7", "OPENAI_API_KEY": "sk-test"})
+
+    assert settings.conversation_turns == 7
+    assert settings.openai_api_key == "sk-test"
+
+def test_load_precedence(config_file):
+    """Test defaults < file < env < overrides."""
+    settings = Settings.load(
+        config_file=config_file,
+        env={"CONVERSATION_TURNS": "4"},
+        overrides={"results_dir": "/tmp/out", "model": None},
+        use_dotenv=False
+    )
+
+    assert settings.model == "file-model"
+    assert settings.conversation_turns == 4
+    assert settings.results_dir == "/tmp/out"
+
+def test_unknown_setting_rejected():
+    """Test that typos in settings fail loudly."""
+    with pytest.raises(ValueError):
+        Settings().with_overrides(modle="x")
+
+def test_validate_api_key_optional():
+    """Test that offline work can skip the API key check."""
+    settings = Settings()
+    settings.validate(require_api_key=False)
+
+    with pytest.raises(ValueError):
+        settings.validate()
+
+def test_rescore_applies_rubric_formulas():
+    """Test recomputing derived scores from cached subscales."""
+    score = EvaluationScore(
+        empathy_reflection=8, validation_affirmation=7, question_quality=9,
+        supportive_tone=8, alliance_goal=2, alliance_approach=3, alliance_bond=2,
+        alliance_score=0, overall_score=0,
+        strengths="", improvements=""
+    )
+    rescored = score.rescored()
+
+    assert rescored.alliance_score == compute_alliance_score(2, 3, 2) == 8
+    assert rescored.overall_score == compute_overall_score(8, 7, 9, 8, 8) == 8
+    assert score.overall_score == 0
+
+    flagged = EvaluationScore(**{**score.to_dict(), "red_flags": "harmful advice"})
+    assert flagged.rescored().overall_score == 1
@@ -0,0 +1,170 @@
+import asyncio
+import random
+import pytest
+from src.client import ClientSimulator
+from src.config import Settings
+from src.conversation import ConversationOrchestrator
+from src.dedup import NearDuplicateIndex, choose_bands
+from src.evaluator import EvaluationScore
+from src.personas import PERSONAS
+
+VOCAB = [f"word{i}" for i in range(2000)]
+
+def random_text(rng, words=400):
+    """Generate an unrelated transcript-sized text."""
+    return " ".join(rng.choice(VOCAB) for _ in range(words))
+
+def perturb(rng, text, fraction):
+    """Replace a fraction of the words in ``text``."""
+    words = text.split()
+    for i in rng.sample(range(len(words)), int(fraction * len(words))):
+        words[i] = rng.choice(VOCAB)
+    return " ".join(words)
+
+def test_choose_bands_errs_towards_recall():
+    """Test that the LSH threshold sits at or below the Jaccard threshold."""
+    bands, rows = choose_bands(128, 0.8)
+    assert bands * rows == 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+
+def test_near_duplicates_join_the_representative_cluster():
+    """Test incremental clustering of near-duplicate transcripts."""
+    rng = random.Random(0)
+    base = random_text(rng)
+    index = NearDuplicateIndex(threshold=0.5)
+
+    assert index.add("a", base) is None
+    assert index.add("b", random_text(rng)) is None
+    match = index.add("c", perturb(rng, base, 0.02))
+    assert match.representative == "a"
+    assert match.similarity >= 0.5
+    assert index.add("d", perturb(rng, base, 0.02)).representative == "a"
+
+    stats = index.stats()
+    assert stats["transcripts"] == 4
+    assert stats["clusters"] == 2
+    assert stats["near_duplicates"] == 2
+    assert stats["largest_cluster"] == 3
+
+def test_duplicate_keys_rejected():
+    """Test that keys must be unique."""
+    index = NearDuplicateIndex()
+    index.add(1, "hello there")
+    with pytest.raises(ValueError):
+        index.add(1, "hello there")
+
+def make_orchestrator(monkeypatch, evaluate):
+    """Create an orchestrator whose conversations are all identical."""
+    orchestrator = ConversationOrchestrator(
+        Settings(openai_api_key="test", conversation_turns=2, reuse_duplicate_evaluations=True)
+    )
+
+    async def generate_message(self, history):
+        return "Same client message every time."
+
+    async def respond(history):
+        return "Same reply every time."
+
+    monkeypatch.setattr(ClientSimulator, "generate_message", generate_message)
+    monkeypatch.setattr(orchestrator.therapist, "respond", respond)
+    monkeypatch.setattr(orchestrator.evaluator, "evaluate", evaluate)
+    return orchestrator
+
+@pytest.mark.asyncio
+async def test_orchestrator_reuses_representative_evaluation(monkeypatch):
+    """Test that identical transcripts share one evaluator call."""
+    calls = []
+
+    async def evaluate(transcript):
+        calls.append(transcript)
+        return EvaluationScore(5, 5, 5, 5, 2, 2, 2, 7, 5, "", "")
+
+    orchestrator = make_orchestrator(monkeypatch, evaluate)
+    results = [await orchestrator.run_conversation(p) for p in PERSONAS[:3]]
+
+    assert len(calls) == 1
+    assert [r.duplicate_of for r in results] == [None, 0, 0]
+    assert [r.evaluation_reused for r in results] == [False, True, True]
+    assert results[1].evaluation == results[0].evaluation
+    assert results[1].evaluation is not results[0].evaluation
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_representative_evaluation(monkeypatch):
+    """Test that duplicates finishing mid-evaluation reuse it instead of re-evaluating."""
+    calls = []
+
+    async def evaluate(transcript):
+        calls.append(transcript)
+        await asyncio.sleep(0.05)
+        return EvaluationScore(5, 5, 5, 5, 2, 2, 2, 7, 5, "", "")
+
+    orchestrator = make_orchestrator(monkeypatch, evaluate)
+    results = await orchestrator.run_multiple_conversations([PERSONAS[0]] * 10)
+
+    assert len(calls) == 1
+    assert len(results) == 10
+    assert sum(r.evaluation_reused for r in results) == 9
+
+@pytest.mark.asyncio
+async def test_duplicates_evaluate_themselves_if_representative_fails(monkeypatch):
+    """Test that a failed representative evaluation doesn't strand its duplicates."""
+    calls = []
+
+    async def evaluate(transcript):
+        calls.append(transcript)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError("API error")
+        return EvaluationScore(5, 5, 5, 5, 2, 2, 2, 7, 5, "", "")
+
+    orchestrator = make_orchestrator(monkeypatch, evaluate)
+    results = await orchestrator.run_multiple_conversations([PERSONAS[0]] * 4)
+
+    assert len(calls) == 4
+    assert len(results) == 3
+    assert not any(r.evaluation_reused for r in results)
+    assert orchestrator.governor.failed == 1
+
+@pytest.mark.asyncio
+async def test_summary_survives_a_failed_representative(monkeypatch, tmp_path, capsys):
+    """Test that duplicates of a failed representative are still summarized and saved."""
+    from src.main import TherapyEvalCLI
+    from src.store import ResultStore
+
+    calls = []
+
+    async def evaluate(transcript):
+        calls.append(transcript)
+        await asyncio.sleep(0.05)
+        if len(calls) == 1:
+            raise RuntimeError("API error")
+        return EvaluationScore(5, 5, 5, 5, 2, 2, 2, 7, 5, "", "")
+
+    cli = TherapyEvalCLI(Settings(openai_api_key="test", store_dir=str(tmp_path / "store")))
+    cli._orchestrator = make_orchestrator(monkeypatch, evaluate)
+    results = await cli.run_evaluation(num_conversations=4)
+
+    assert len(results) == 3
+    assert all(r.duplicate_of is not None for r in results)
+    output = capsys.readouterr().out
+    assert "Average Overall Score (distinct transcripts only): 5.0/10" in output
+    with ResultStore(cli.settings.store_dir) as store:
+        assert len(store.query()) == 3
+
+def test_clusters_do_not_drift_through_chains():
+    """Test that each match is checked against the representative, not a chain member."""
+    rng = random.Random(0)
+    text = random_text(rng)
+    index = NearDuplicateIndex(threshold=0.5)
+    signatures = []
+    for key in range(10):
+        signature = index.signature(text)
+        signatures.append(signature)
+        match = index.add(key, text, signature=signature)
+        if match:
+            true_similarity = index.similarity(signature, signatures[match.representative])
+            assert match.similarity == true_similarity
+            assert match.similarity >= 0.5
+        text = perturb(rng, text, 0.04)
+
+    assert len(index.clusters()) > 1
@@ -0,0 +1,69 @@
+import io
+import json
+import asyncio
+import pytest
+from src.output import Reporter, get_reporter
+
+def read_events(stream):
+    """Parse JSON-lines output."""
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+@pytest.mark.asyncio
+async def test_jsonl_log_events_are_structured():
+    """Test that log events become one JSON object per line."""
+    stream = io.StringIO()
+    async with Reporter("jsonl", stream=stream) as reporter:
+        assert get_reporter() is reporter
+        reporter.log("error", "Therapist response error", error="timeout")
+
+    events = read_events(stream)
+    assert events == [{
+        "ts": events[0]["ts"],
+        "event": "log",
+        "level": "error",
+        "message": "Therapist response error",
+        "error": "timeout"
+    }]
+    assert get_reporter() is not reporter
+
+@pytest.mark.asyncio
+async def test_progress_redraws_are_rate_limited():
+    """Test that many concurrent advances collapse into few redraws."""
+    stream = io.StringIO()
+    async with Reporter("jsonl", stream=stream, min_interval=60) as reporter:
+        reporter.start_progress(500)
+
+        async def work():
+            await asyncio.sleep(0)
+            reporter.advance()
+
+        await asyncio.gather(*(work() for _ in range(500)))
+
+    progress = [e for e in read_events(stream) if e["event"] == "progress"]
+    assert len(progress) <= 3
+    assert progress[-1]["completed"] == progress[-1]["total"] == 500
+
+def test_logs_outside_event_loop_render_synchronously():
+    """Test that library code can log without a running reporter."""
+    stream = io.StringIO()
+    Reporter("text", stream=stream).log("error", "Evaluation error", error="boom")
+
+    assert stream.getvalue() == "[ERROR] Evaluation error error=boom\n"
+
+def test_jsonl_transcript_is_an_event(capsys):
+    """Test that --show-transcript keeps jsonl stdout machine-readable."""
+    from src.config import Settings
+    from src.main import TherapyEvalCLI
+    from src.models import ConversationResult, EvaluationScore
+    from src.personas import PERSONAS
+
+    evaluation = EvaluationScore(7, 7, 7, 7, 2, 2, 2, 7, 7, "warm", "none")
+    transcript = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}]
+    result = ConversationResult(PERSONAS[0], transcript, evaluation, 1.0)
+
+    TherapyEvalCLI(Settings(log_format="jsonl")).print_transcript([result], 1)
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [e["event"] for e in events] == ["transcript"]
+    assert events[0]["persona"] == PERSONAS[0].name
+    assert events[0]["transcript"] == transcript
@@ -0,0 +1,198 @@
+import json
+import os
+import pytest
+from src.store import ResultStore, run_id_from_filename
+
+def make_run(scores, model="gpt-4.1-mini"):
+    """Build run data in the format written by save_results."""
+    return {
+        "timestamp": "2025-01-01T00:00:00",
+        "config": {"model": model, "turns_per_conversation": 5, "num_conversations": len(scores)},
+        "results": [
+            {
+                "persona": {"name": name, "age": 52, "background": "", "presenting_issue": ""},
+                "transcript": [{"role": "user", "content": f"{name} message"}],
+                "evaluation": {"overall_score": score, "empathy_reflection": score,
+                               "red_flags": "harmful advice" if flagged else None},
+                "duration_seconds": 1.0,
+                "timestamp": "2025-01-01T00:00:00"
+            }
+            for name, score, flagged in scores
+        ]
+    }
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an empty store."""
+    with ResultStore(str(tmp_path / "store"), segment_size=200) as store:
+        yield store
+
+def test_query_filters_and_random_access(store):
+    """Test index filters and reading records back from segments."""
+    store.add_run(make_run([("Grace", 2, True), ("Grace", 8, False), ("Alex", 3, True)]), "run1")
+    store.add_run(make_run([("Grace", 3, True)], model="gpt-4o"), "run2")
+
+    rows = store.query(persona="Grace", red_flags=True, max_score=3)
+    assert [(r["run_id"], r["overall_score"]) for r in rows] == [("run2", 3), ("run1", 2)]
+    assert [r["run_id"] for r in store.query(model="gpt-4o")] == ["run2"]
+
+    records = list(store.iter_records(rows))
+    assert records[1]["transcript"] == [{"role": "user", "content": "Grace message"}]
+    assert records[0]["model"] == "gpt-4o"
+
+def test_segments_rotate(store):
+    """Test that full segments are closed and a new one started."""
+    store.add_run(make_run([("Grace", 5, False)] * 3), "run1")
+    store.add_run(make_run([("Alex", 5, False)]), "run2")
+
+    segments = {r["segment"] for r in store.query()}
+    assert len(segments) == 2
+
+def test_import_json_is_idempotent(store, tmp_path):
+    """Test importing existing results files once."""
+    path = tmp_path / "eval_results_20250101_000000.json"
+    path.write_text(json.dumps(make_run([("Sam", 6, False)]), indent=2))
+
+    assert store.import_json(str(path)) == 1
+    assert store.import_json(str(path)) == 0
+    assert run_id_from_filename(str(path)) == "20250101_000000"
+    assert [r["run_id"] for r in store.runs()] == ["20250101_000000"]
+
+def test_load_run_rebuilds_saved_format(store):
+    """Test that a run round-trips with its config and summaries."""
+    data = make_run([("Grace", 2, True), ("Alex", 7, False)])
+    data["diversity"] = {"clusters": 2}
+    store.add_run(data, "run1")
+    store.add_run(make_run([("Sam", 5, False)]), "run2")
+
+    assert store.load_run("run1") == data
+    assert store.latest_run_id() == "run2"
+    with pytest.raises(ValueError):
+        store.load_run("missing")
+
+def make_legacy_store(root, data, run_id):
+    """Write an archive in the original format: per-record gzip, no run metadata."""
+    import gzip
+    import sqlite3
+    from src.store import SCHEMA, SCORE_COLUMNS
+
+    (root / "segments").mkdir(parents=True)
+    conn = sqlite3.connect(str(root / "index.sqlite"))
+    conn.executescript(SCHEMA.replace(",\n    meta TEXT", "").replace(
+        ",\n    position INTEGER  -- line within the block; NULL for per-record gzip members", ""
+    ))
+    with open(root / "segments" / "seg_00000.gz", "wb") as f:
+        for result in data["results"]:
+            blob = gzip.compress(json.dumps(result).encode("utf-8"))
+            evaluation = result["evaluation"]
+            conn.execute(
+                f"INSERT INTO conversations (run_id, persona, age, {', '.join(SCORE_COLUMNS)}, "
+                "red_flags, duration_seconds, timestamp, segment, offset, length) "
+                f"VALUES ({', '.join('?' * (len(SCORE_COLUMNS) + 9))})",
+                (run_id, result["persona"]["name"], 52,
+                 *(evaluation.get(column) for column in SCORE_COLUMNS),
+                 1 if evaluation["red_flags"] else 0, 1.0, None, "seg_00000.gz", f.tell(), len(blob))
+            )
+            f.write(blob)
+    conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                 (run_id, data["timestamp"], data["config"]["model"], 5, len(data["results"]), None))
+    conn.commit()
+    conn.close()
+
+def test_legacy_archives_are_migrated_and_compacted(tmp_path):
+    """Test reading, extending and compacting an archive in the original format."""
+    root = tmp_path / "store"
+    legacy = make_run([("Grace", 4, False), ("Alex", 6, True)])
+    make_legacy_store(root, legacy, "run1")
+
+    with ResultStore(str(root)) as store:
+        data = store.load_run("run1")
+        assert data["config"]["model"] == "gpt-4.1-mini"
+        assert data["results"] == legacy["results"]
+
+        store.add_run(make_run([("Sam", 5, False)]), "run2")
+        assert sorted(os.listdir(store.segments_dir)) == ["seg_00000.gz", "seg_00001.xz"]
+
+        store.compact()
+        assert sorted(os.listdir(store.segments_dir)) == ["seg_00002.xz"]
+        assert store.load_run("run1")["results"] == legacy["results"]
+        assert [r["persona"] for r in store.query(run_id="run2")] == ["Sam"]
+
+def test_compact_reclaims_replaced_runs_and_merges_blocks(tmp_path):
+    """Test that compaction drops replaced records and packs runs into shared blocks."""
+    with ResultStore(str(tmp_path / "store")) as store:
+        for run_id in ("run1", "run2", "run3"):
+            store.add_run(make_run([("Grace", 2, True), ("Alex", 7, False)]), run_id)
+        store.add_run(make_run([("Sam", 5, False)]), "run1", replace=True)
+        assert len({(r["segment"], r["offset"]) for r in store.query()}) == 3
+
+        before, after = store.compact()
+        assert after == store.size() < before
+        assert len({(r["segment"], r["offset"]) for r in store.query()}) == 1
+        assert [r["persona"] for r in store.query(run_id="run1")] == ["Sam"]
+        assert store.load_run("run2")["results"] == make_run(
+            [("Grace", 2, True), ("Alex", 7, False)]
+        )["results"]
+
+def test_add_run_replace(store):
+    """Test that replacing a run re-indexes it instead of duplicating it."""
+    store.add_run(make_run([("Grace", 2, True), ("Alex", 3, False)]), "run1")
+    assert store.add_run(make_run([("Grace", 4, False)]), "run1") == 0
+    assert store.add_run(make_run([("Grace", 4, False)]), "run1", replace=True) == 1
+
+    assert [(r["persona"], r["overall_score"]) for r in store.query()] == [("Grace", 4)]
+    assert len(store.runs()) == 1
+
+def make_cli_results(overall_score):
+    """Build results whose stored overall score may be stale."""
+    from src.models import ConversationResult, EvaluationScore
+    from src.personas import PERSONAS
+
+    evaluation = EvaluationScore(8, 8, 8, 8, 3, 3, 3, 10, overall_score, "warm", "none")
+    return [ConversationResult(p, [{"role": "user", "content": p.name}], evaluation, 1.0)
+            for p in PERSONAS[:2]]
+
+def test_saved_run_ids_are_unique(tmp_path):
+    """Test that runs saved within the same second are all archived."""
+    from src.config import Settings
+    from src.main import TherapyEvalCLI
+
+    cli = TherapyEvalCLI(Settings(store_dir=str(tmp_path / "store"), log_format="jsonl"))
+    run_ids = {cli.save_results(make_cli_results(8))[0] for _ in range(3)}
+
+    assert len(run_ids) == 3
+    with ResultStore(cli.settings.store_dir) as store:
+        assert len(store.query()) == 6
+
+def test_rescore_save_replaces_source_run(tmp_path):
+    """Test that rescore --save updates the source run in place."""
+    from click.testing import CliRunner
+    from src.config import Settings
+    from src.main import TherapyEvalCLI, main
+
+    store_dir = str(tmp_path / "store")
+    cli = TherapyEvalCLI(Settings(store_dir=store_dir, log_format="jsonl"))
+    run_id, _ = cli.save_results(make_cli_results(3), config={"model": "gpt-4o"},
+                                 diversity={"clusters": 2})
+
+    outcome = CliRunner().invoke(main, ["rescore", "--save", "--store-dir", store_dir])
+    assert outcome.exit_code == 0, outcome.output
+
+    with ResultStore(store_dir) as store:
+        assert [r["run_id"] for r in store.runs()] == [run_id]
+        data = store.load_run(run_id)
+    assert data["config"]["model"] == "gpt-4o"
+    assert data["diversity"] == {"clusters": 2}
+    assert [r["evaluation"]["overall_score"] for r in data["results"]] == [8, 8]
+
+def test_archive_commands_do_not_create_missing_stores(tmp_path):
+    """Test that reading a missing archive fails instead of creating an empty one."""
+    from click.testing import CliRunner
+    from src.main import main
+
+    store_dir = str(tmp_path / "typo")
+    for command in (["archive", "query"], ["archive", "export"], ["report", "--run", "x"]):
+        outcome = CliRunner().invoke(main, [*command, "--store-dir", store_dir])
+        assert outcome.exit_code == 1
+        assert f"No archive found in {store_dir}" in outcome.output
+    assert not os.path.exists(store_dir)